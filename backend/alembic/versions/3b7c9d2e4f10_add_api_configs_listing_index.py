@@ -0,0 +1,37 @@
+"""Add api_configs listing index
+
+Revision ID: 3b7c9d2e4f10
+Revises: fe12ae1aabae
+Create Date: 2026-10-16 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c9d2e4f10'
+down_revision: Union[str, Sequence[str], None] = 'fe12ae1aabae'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # api_configs is created by init_db's create_all, which adds the index to new tables
+    if not sa.inspect(op.get_bind()).has_table('api_configs'):
+        return
+    op.create_index(
+        'ix_api_configs_lender_method_active_created',
+        'api_configs',
+        ['lender_id', 'method', 'is_active', sa.text('created_at DESC')],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_api_configs_lender_method_active_created', table_name='api_configs', if_exists=True)
@@ -0,0 +1,37 @@
+"""Add deployed_apis lender listing index
+
+Revision ID: 5d2f8b7a9c41
+Revises: 8e4a1f6c2b93
+Create Date: 2026-10-16 14:32:08.614027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2f8b7a9c41'
+down_revision: Union[str, Sequence[str], None] = '8e4a1f6c2b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # deployed_apis is created by init_db's create_all, which adds the index to new tables
+    if not sa.inspect(op.get_bind()).has_table('deployed_apis'):
+        return
+    op.create_index(
+        'ix_deployed_apis_lender_status_deployed',
+        'deployed_apis',
+        ['lender_id', 'status', sa.text('deployed_at DESC')],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_deployed_apis_lender_status_deployed', table_name='deployed_apis', if_exists=True)
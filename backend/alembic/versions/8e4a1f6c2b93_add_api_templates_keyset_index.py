@@ -0,0 +1,37 @@
+"""Add api_templates keyset index
+
+Revision ID: 8e4a1f6c2b93
+Revises: 3b7c9d2e4f10
+Create Date: 2026-10-16 11:04:27.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4a1f6c2b93'
+down_revision: Union[str, Sequence[str], None] = '3b7c9d2e4f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # api_templates is created by init_db's create_all, which adds the index to new tables
+    if not sa.inspect(op.get_bind()).has_table('api_templates'):
+        return
+    op.create_index(
+        'ix_api_templates_created_id',
+        'api_templates',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_api_templates_created_id', table_name='api_templates', if_exists=True)
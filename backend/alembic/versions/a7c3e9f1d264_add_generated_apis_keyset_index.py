@@ -0,0 +1,37 @@
+"""Add generated_apis keyset index
+
+Revision ID: a7c3e9f1d264
+Revises: 5d2f8b7a9c41
+Create Date: 2026-10-16 16:12:45.208331
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1d264'
+down_revision: Union[str, Sequence[str], None] = '5d2f8b7a9c41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # generated_apis is created by init_db's create_all, which adds the index to new tables
+    if not sa.inspect(op.get_bind()).has_table('generated_apis'):
+        return
+    op.create_index(
+        'ix_generated_apis_created_id',
+        'generated_apis',
+        [sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_generated_apis_created_id', table_name='generated_apis', if_exists=True)
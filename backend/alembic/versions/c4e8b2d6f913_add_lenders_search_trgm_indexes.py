@@ -0,0 +1,50 @@
+"""Add lenders search trigram indexes
+
+Revision ID: c4e8b2d6f913
+Revises: a7c3e9f1d264
+Create Date: 2026-10-16 17:41:19.734562
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8b2d6f913'
+down_revision: Union[str, Sequence[str], None] = 'a7c3e9f1d264'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # lenders is created by init_db's create_all, which adds the indexes to new tables
+    if not sa.inspect(op.get_bind()).has_table('lenders'):
+        return
+    op.create_index(
+        'ix_lenders_name_trgm',
+        'lenders',
+        ['name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'name': 'gin_trgm_ops'},
+        if_not_exists=True
+    )
+    op.create_index(
+        'ix_lenders_description_trgm',
+        'lenders',
+        ['description'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+        if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_lenders_description_trgm', table_name='lenders', if_exists=True)
+    op.drop_index('ix_lenders_name_trgm', table_name='lenders', if_exists=True)
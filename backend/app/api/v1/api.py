@@ -3,102 +3,29 @@ from .endpoints import lenders, api_configs, api_templates, generated_apis, api_
 
 api_router = APIRouter()
 
-# Include all endpoint routers
-api_router.include_router(
-    lenders.router,
-    prefix="/lenders",
-    tags=["lenders"]
-)
-
-api_router.include_router(
-    steps.router,
-    prefix="/steps",
-    tags=["steps"]
-)
-
-api_router.include_router(
-    integrations.router,
-    prefix="/integrations",
-    tags=["integrations"]
-)
-
-api_router.include_router(
-    api_configs.router,
-    prefix="/api-configs",
-    tags=["api-configs"]
-)
-
-api_router.include_router(
-    api_templates.router,
-    prefix="/api-templates",
-    tags=["api-templates"]
-)
-
-api_router.include_router(
-    generated_apis.router,
-    prefix="/generated-apis",
-    tags=["generated-apis"]
-)
-
-api_router.include_router(
-    api_tests.router,
-    prefix="/api-tests",
-    tags=["api-tests"]
-)
-
-api_router.include_router(
-    users.router,
-    prefix="/users",
-    tags=["users"]
-)
+# (module, prefix, tags) for every endpoint router, in registration order
+ROUTES = [
+    (lenders, "/lenders", ["lenders"]),
+    (steps, "/steps", ["steps"]),
+    (integrations, "/integrations", ["integrations"]),
+    (api_configs, "/api-configs", ["api-configs"]),
+    (api_templates, "/api-templates", ["api-templates"]),
+    (generated_apis, "/generated-apis", ["generated-apis"]),
+    (api_tests, "/api-tests", ["api-tests"]),
+    (users, "/users", ["users"]),
+    (deployments, "/deployments", ["deployments"]),
+    (samples, "/samples", ["samples"]),
+    (analytics, "/analytics", ["analytics"]),
+    # Health under versioned API as well
+    (health, "/health", ["health"]),
+    # Public-facing external routes that trigger configured sequences
+    (external, "/external", ["external"]),
+    # Auth and validation
+    (auth, "/auth", ["auth"]),
+    (validation, "", ["validation"]),
+    (utils, "/utils", ["utils"]),
+]
 
-api_router.include_router(
-    deployments.router,
-    prefix="/deployments",
-    tags=["deployments"]
-)
-
-api_router.include_router(
-    samples.router,
-    prefix="/samples",
-    tags=["samples"]
-)
-
-api_router.include_router(
-    analytics.router,
-    prefix="/analytics",
-    tags=["analytics"]
-)
-
-# Health under versioned API as well
-api_router.include_router(
-    health.router,
-    prefix="/health",
-    tags=["health"]
-)
-
-# Public-facing external routes that trigger configured sequences
-api_router.include_router(
-    external.router,
-    prefix="/external",
-    tags=["external"]
-)
-
-# Auth and validation
-api_router.include_router(
-    auth.router,
-    prefix="/auth",
-    tags=["auth"]
-)
-
-api_router.include_router(
-    validation.router,
-    prefix="",
-    tags=["validation"]
-)
-
-api_router.include_router(
-    utils.router,
-    prefix="/utils",
-    tags=["utils"]
-)
+# Include all endpoint routers
+for module, prefix, tags in ROUTES:
+    api_router.include_router(module.router, prefix=prefix, tags=tags)
@@ -1,26 +1,66 @@
-from typing import Dict, Any, List, Optional
-from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import Dict, Any, List, Optional, Awaitable, Callable
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
+import asyncio
+import ormsgpack
 
-from ....core.database import get_db
+from ....core.database import get_db, AsyncSessionLocal
+from ....core.cache import ANALYTICS_CACHE_PREFIX, cache_get, cache_set, namespace_key
 from ....services.analytics_service import AnalyticsService
 from ....schemas.common import ResponseModel
 import structlog
 
-logger = structlog.get_logger()
-router = APIRouter()
+logger = structlog.get_logger(__name__)
+router = APIRouter(default_response_class=ORJSONResponse)
+
+REAL_TIME_CACHE_KEY = "real_time_metrics"
+REAL_TIME_CACHE_TTL = 15
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Seconds an ETag for comprehensive analytics may stay valid without data changes
+COMPREHENSIVE_VERSION_BUCKET = 60
+
+# AnalyticsService is stateless, so one instance serves every request
+_service = AnalyticsService()
+
+
+def get_analytics_service() -> AnalyticsService:
+    """Dependency returning the shared analytics service"""
+    return _service
+
+
+async def _with_session(method: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any) -> Any:
+    """Run an analytics query on its own session so it can overlap with others"""
+    async with AsyncSessionLocal() as session:
+        return await method(session, *args, **kwargs)
+
+
+async def _gather_sections(sections: Dict[str, Awaitable[Any]]) -> Dict[str, Any]:
+    """Await independent analytics sections concurrently, keyed by section name"""
+    results = await asyncio.gather(*sections.values(), return_exceptions=True)
+    failed = {
+        name: result for name, result in zip(sections, results)
+        if isinstance(result, BaseException)
+    }
+    for name, error in failed.items():
+        logger.error("Analytics section failed", section=name, error=str(error))
+    if failed:
+        raise next(iter(failed.values()))
+    return dict(zip(sections, results))
 
 
 @router.get("/dashboard-metrics")
 async def get_dashboard_metrics(
     days: int = Query(30, description="Number of days to analyze"),
     lender_id: Optional[int] = Query(None, description="Filter by specific lender"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[Dict[str, Any]]:
     """Get comprehensive dashboard metrics"""
     try:
-        analytics_service = AnalyticsService()
         metrics = await analytics_service.get_dashboard_metrics(db, days, lender_id)
         
         return ResponseModel(
@@ -29,18 +69,18 @@ async def get_dashboard_metrics(
             message="Dashboard metrics retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get dashboard metrics: {e}")
+        logger.error("Failed to get dashboard metrics", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get dashboard metrics")
 
 
 @router.get("/lender-performance")
 async def get_lender_performance(
     days: int = Query(30, description="Number of days to analyze"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[List[Dict[str, Any]]]:
     """Get performance metrics by lender"""
     try:
-        analytics_service = AnalyticsService()
         performance = await analytics_service.get_lender_performance(db, days)
         
         return ResponseModel(
@@ -49,7 +89,7 @@ async def get_lender_performance(
             message="Lender performance metrics retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get lender performance: {e}")
+        logger.error("Failed to get lender performance", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get lender performance")
 
 
@@ -57,11 +97,11 @@ async def get_lender_performance(
 async def get_error_analysis(
     days: int = Query(30, description="Number of days to analyze"),
     lender_id: Optional[int] = Query(None, description="Filter by specific lender"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[List[Dict[str, Any]]]:
     """Get error analysis and trends"""
     try:
-        analytics_service = AnalyticsService()
         errors = await analytics_service.get_error_analysis(db, days, lender_id)
         
         return ResponseModel(
@@ -70,7 +110,7 @@ async def get_error_analysis(
             message="Error analysis retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get error analysis: {e}")
+        logger.error("Failed to get error analysis", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get error analysis")
 
 
@@ -78,11 +118,11 @@ async def get_error_analysis(
 async def get_response_time_trends(
     days: int = Query(30, description="Number of days to analyze"),
     lender_id: Optional[int] = Query(None, description="Filter by specific lender"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[List[Dict[str, Any]]]:
     """Get response time trends over time"""
     try:
-        analytics_service = AnalyticsService()
         trends = await analytics_service.get_response_time_trends(db, days, lender_id)
         
         return ResponseModel(
@@ -91,17 +131,17 @@ async def get_response_time_trends(
             message="Response time trends retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get response time trends: {e}")
+        logger.error("Failed to get response time trends", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get response time trends")
 
 
 @router.get("/integration-health")
 async def get_integration_health(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[List[Dict[str, Any]]]:
     """Get health status of all integrations"""
     try:
-        analytics_service = AnalyticsService()
         health = await analytics_service.get_integration_health(db)
         
         return ResponseModel(
@@ -110,18 +150,18 @@ async def get_integration_health(
             message="Integration health status retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get integration health: {e}")
+        logger.error("Failed to get integration health", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get integration health")
 
 
 @router.get("/field-mapping-analytics")
 async def get_field_mapping_analytics(
     lender_id: Optional[int] = Query(None, description="Filter by specific lender"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[Dict[str, Any]]:
     """Get analytics about field mapping usage and effectiveness"""
     try:
-        analytics_service = AnalyticsService()
         analytics = await analytics_service.get_field_mapping_analytics(db, lender_id)
         
         return ResponseModel(
@@ -130,18 +170,18 @@ async def get_field_mapping_analytics(
             message="Field mapping analytics retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get field mapping analytics: {e}")
+        logger.error("Failed to get field mapping analytics", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get field mapping analytics")
 
 
 @router.get("/sequence-performance")
 async def get_sequence_performance(
     days: int = Query(30, description="Number of days to analyze"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[List[Dict[str, Any]]]:
     """Get performance metrics for integration sequences"""
     try:
-        analytics_service = AnalyticsService()
         performance = await analytics_service.get_sequence_performance(db, days)
         
         return ResponseModel(
@@ -150,74 +190,86 @@ async def get_sequence_performance(
             message="Sequence performance metrics retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get sequence performance: {e}")
+        logger.error("Failed to get sequence performance", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get sequence performance")
 
 
 @router.get("/comprehensive-analytics")
 async def get_comprehensive_analytics(
+    request: Request,
+    response: Response,
     days: int = Query(30, description="Number of days to analyze"),
     lender_id: Optional[int] = Query(None, description="Filter by specific lender"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[Dict[str, Any]]:
     """Get comprehensive analytics for all aspects"""
     try:
-        analytics_service = AnalyticsService()
+        # Internal consumers can ask for msgpack instead of JSON; each
+        # representation gets its own ETag
+        use_msgpack = MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+        
+        # Polling dashboards get a 304 until the underlying data changes
+        version = await analytics_service.get_data_version(db, COMPREHENSIVE_VERSION_BUCKET)
+        etag = f'W/"{version}:{days}:{lender_id}:{"msgpack" if use_msgpack else "json"}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
         
-        # Get all analytics data
-        dashboard_metrics = await analytics_service.get_dashboard_metrics(db, days, lender_id)
-        lender_performance = await analytics_service.get_lender_performance(db, days)
-        error_analysis = await analytics_service.get_error_analysis(db, days, lender_id)
-        response_time_trends = await analytics_service.get_response_time_trends(db, days, lender_id)
-        integration_health = await analytics_service.get_integration_health(db)
-        field_mapping_analytics = await analytics_service.get_field_mapping_analytics(db, lender_id)
-        sequence_performance = await analytics_service.get_sequence_performance(db, days)
+        # All sections come back from one fused query, cached per data version
+        # so the body always matches the ETag
+        sections = await analytics_service.get_comprehensive(db, days, lender_id, version)
         
         comprehensive_data = {
-            "dashboard_metrics": dashboard_metrics,
-            "lender_performance": lender_performance,
-            "error_analysis": error_analysis,
-            "response_time_trends": response_time_trends,
-            "integration_health": integration_health,
-            "field_mapping_analytics": field_mapping_analytics,
-            "sequence_performance": sequence_performance,
+            **sections,
             "analysis_period_days": days,
             "lender_filter": lender_id
         }
         
-        return ResponseModel(
+        result = ResponseModel(
             success=True,
             data=comprehensive_data,
             message="Comprehensive analytics retrieved successfully"
         )
+        
+        if use_msgpack:
+            return Response(
+                content=ormsgpack.packb(result.model_dump()),
+                media_type=MSGPACK_MEDIA_TYPE,
+                headers={"ETag": etag, "Vary": "Accept"}
+            )
+        
+        response.headers["Vary"] = "Accept"
+        return result
     except Exception as e:
-        logger.error(f"Failed to get comprehensive analytics: {e}")
+        logger.error("Failed to get comprehensive analytics", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get comprehensive analytics")
 
 
 @router.get("/real-time-metrics")
 async def get_real_time_metrics(
-    db: AsyncSession = Depends(get_db)
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[Dict[str, Any]]:
     """Get real-time metrics for the last hour"""
     try:
-        analytics_service = AnalyticsService()
+        # Versioned under the analytics namespace, so new logs retire it too
+        real_time_key = await namespace_key(ANALYTICS_CACHE_PREFIX, REAL_TIME_CACHE_KEY)
+        real_time_data = await cache_get(real_time_key)
         
-        # Get metrics for last hour
-        hourly_metrics = await analytics_service.get_dashboard_metrics(db, 1)
-        
-        # Get recent errors (last hour)
-        recent_errors = await analytics_service.get_error_analysis(db, 1)
-        
-        # Get integration health
-        health_status = await analytics_service.get_integration_health(db)
-        
-        real_time_data = {
-            "hourly_metrics": hourly_metrics,
-            "recent_errors": recent_errors[:5],  # Top 5 recent errors
-            "health_status": health_status,
-            "timestamp": datetime.now().isoformat()
-        }
+        if real_time_data is None:
+            # Metrics + top errors share one log scan; health runs alongside it
+            sections = await _gather_sections({
+                "snapshot": _with_session(analytics_service.get_recent_snapshot, 1, error_limit=5),
+                "health_status": _with_session(analytics_service.get_integration_health),
+            })
+            
+            real_time_data = {
+                "hourly_metrics": sections["snapshot"]["metrics"],
+                "recent_errors": sections["snapshot"]["errors"],  # Top 5 recent errors
+                "health_status": sections["health_status"],
+                "timestamp": datetime.now()
+            }
+            await cache_set(real_time_key, real_time_data, REAL_TIME_CACHE_TTL)
         
         return ResponseModel(
             success=True,
@@ -225,47 +277,41 @@ async def get_real_time_metrics(
             message="Real-time metrics retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get real-time metrics: {e}")
+        logger.error("Failed to get real-time metrics", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get real-time metrics")
 
 
 @router.get("/performance-summary")
 async def get_performance_summary(
     days: int = Query(7, description="Number of days to analyze"),
-    db: AsyncSession = Depends(get_db)
+    analytics_service: AnalyticsService = Depends(get_analytics_service)
 ) -> ResponseModel[Dict[str, Any]]:
     """Get a summary of key performance indicators"""
     try:
-        analytics_service = AnalyticsService()
-        
-        # Get basic metrics
-        metrics = await analytics_service.get_dashboard_metrics(db, days)
-        
-        # Get top performing lenders
-        lender_performance = await analytics_service.get_lender_performance(db, days)
-        top_lenders = lender_performance[:3]  # Top 3 lenders
+        # Limits and health bucketing are applied in SQL by the service
+        sections = await _gather_sections({
+            "metrics": _with_session(analytics_service.get_dashboard_metrics, days),
+            "top_lenders": _with_session(analytics_service.get_lender_performance, days, limit=3),
+            # Error types seen more than 5 times
+            "critical_errors": _with_session(analytics_service.get_error_analysis, days, min_count=6, limit=3),
+            "health_buckets": _with_session(analytics_service.get_health_buckets),
+        })
         
-        # Get critical errors
-        errors = await analytics_service.get_error_analysis(db, days)
-        critical_errors = [e for e in errors if e['count'] > 5][:3]  # Top 3 critical errors
-        
-        # Get health status
-        health = await analytics_service.get_integration_health(db)
-        critical_health = [h for h in health if h['health'] == 'critical']
-        warning_health = [h for h in health if h['health'] == 'warning']
+        critical_health = sections["health_buckets"].get("critical", [])
+        warning_health = sections["health_buckets"].get("warning", [])
         
         summary = {
             "period_days": days,
-            "overall_metrics": metrics,
-            "top_performing_lenders": top_lenders,
-            "critical_errors": critical_errors,
+            "overall_metrics": sections["metrics"],
+            "top_performing_lenders": sections["top_lenders"],
+            "critical_errors": sections["critical_errors"],
             "health_alerts": {
                 "critical_count": len(critical_health),
                 "warning_count": len(warning_health),
                 "critical_integrations": critical_health,
                 "warning_integrations": warning_health
             },
-            "summary_timestamp": datetime.now().isoformat()
+            "summary_timestamp": datetime.now()
         }
         
         return ResponseModel(
@@ -274,5 +320,5 @@ async def get_performance_summary(
             message="Performance summary retrieved successfully"
         )
     except Exception as e:
-        logger.error(f"Failed to get performance summary: {e}")
+        logger.error("Failed to get performance summary", error=str(e))
         raise HTTPException(status_code=500, detail="Failed to get performance summary")
@@ -1,50 +1,51 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from typing import Optional
 import structlog
 
-from ....core.database import get_db
+from ....core.database import get_db, fetch_scalar, fetch_mappings
+from ....core.streaming import dumps, open_list_envelope, close_list_envelope
+from ....core.cache import API_TESTS_COUNT_PREFIX, invalidate_namespace
 from ....models.api_config import APIConfig
+from ....models.api_test import APITest
 from ....models.lender import Lender
 from ....schemas.common import ResponseModel, PaginationParams, PaginationInfo
+from ....schemas.api_config import APIConfigCreate, APIConfigUpdate
 
 logger = structlog.get_logger()
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Postgres SQLSTATE raised when lender_id does not reference a lender
+FOREIGN_KEY_VIOLATION = "23503"
 
 
 @router.post("/", response_model=ResponseModel, status_code=status.HTTP_201_CREATED)
 async def create_api_config(
-    api_config_data: dict,
+    api_config_data: APIConfigCreate,
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new API configuration"""
     try:
-        # Validate lender exists
-        lender_id = api_config_data.get("lender_id")
-        if not lender_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="lender_id is required"
-            )
-        
-        lender_result = await db.execute(
-            select(Lender).where(Lender.id == lender_id)
-        )
-        lender = lender_result.scalar_one_or_none()
-        
-        if not lender:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Lender with ID {lender_id} not found"
-            )
+        lender_id = api_config_data.lender_id
         
-        # Create API config
-        api_config = APIConfig(**api_config_data)
+        api_config = APIConfig(**api_config_data.model_dump(exclude_unset=True))
         db.add(api_config)
-        await db.commit()
-        await db.refresh(api_config)
+        
+        # The lenders foreign key validates lender_id, no pre-check needed
+        try:
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if getattr(e.orig, "sqlstate", None) == FOREIGN_KEY_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Lender with ID {lender_id} not found"
+                )
+            raise
         
         logger.info("API config created successfully", config_id=api_config.id, lender_id=lender_id)
         
@@ -70,17 +71,68 @@ async def create_api_config(
         )
 
 
+async def _render_api_configs(page_query, count_query, pagination: PaginationParams) -> bytes:
+    """Encode one page of API configs inside the standard response envelope.
+
+    The page is at most pagination.size rows, so it is read in full before any
+    byte is produced; a query failure then surfaces as a normal error response.
+    """
+    rows = await fetch_mappings(page_query)
+    
+    if rows:
+        total = rows[0]["total"]
+    else:
+        # No row to read the window total from (empty result or past the last page)
+        total = await fetch_scalar(count_query)
+    
+    pages = (total + pagination.size - 1) // pagination.size
+    
+    return b"".join([
+        open_list_envelope("API configurations retrieved successfully", "api_configs"),
+        b",".join(dumps({key: value for key, value in row.items() if key != "total"}) for row in rows),
+        close_list_envelope(
+            {
+                "total": total,
+                "page": pagination.page,
+                "size": pagination.size,
+                "pages": pages
+            },
+            PaginationInfo(
+                page=pagination.page,
+                size=pagination.size,
+                total=total,
+                pages=pages,
+                has_next=pagination.page < pages,
+                has_prev=pagination.page > 1
+            )
+        )
+    ])
+
+
 @router.get("/", response_model=ResponseModel)
 async def get_api_configs(
     pagination: PaginationParams = Depends(),
     lender_id: Optional[int] = Query(None, description="Filter by lender ID"),
     method: Optional[str] = Query(None, description="Filter by HTTP method"),
-    is_active: Optional[bool] = Query(None, description="Filter by active status"),
-    db: AsyncSession = Depends(get_db)
+    is_active: Optional[bool] = Query(None, description="Filter by active status")
 ):
     """Get paginated list of API configurations"""
     try:
-        query = select(APIConfig).options(selectinload(APIConfig.lender))
+        # Flat projection joined to the lender; the window count carries the
+        # unpaginated total on every row
+        query = select(
+            APIConfig.id,
+            APIConfig.name,
+            APIConfig.description,
+            APIConfig.lender_id,
+            Lender.name.label("lender_name"),
+            APIConfig.endpoint_path,
+            APIConfig.method,
+            APIConfig.is_active,
+            APIConfig.version,
+            APIConfig.created_at,
+            func.count().over().label("total")
+        ).join(Lender, Lender.id == APIConfig.lender_id, isouter=True)
         
         if lender_id:
             query = query.where(APIConfig.lender_id == lender_id)
@@ -91,59 +143,25 @@ async def get_api_configs(
         if is_active is not None:
             query = query.where(APIConfig.is_active == is_active)
         
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query)
-        
         # Apply pagination
         offset = (pagination.page - 1) * pagination.size
-        query = query.offset(offset).limit(pagination.size)
+        page_query = query.offset(offset).limit(pagination.size)
         
         # Apply sorting
         if pagination.sort_by:
             sort_column = getattr(APIConfig, pagination.sort_by, APIConfig.created_at)
             if pagination.sort_order == "desc":
                 sort_column = sort_column.desc()
-            query = query.order_by(sort_column)
+            page_query = page_query.order_by(sort_column)
         else:
-            query = query.order_by(APIConfig.created_at.desc())
-        
-        result = await db.execute(query)
-        api_configs = result.scalars().all()
+            page_query = page_query.order_by(APIConfig.created_at.desc())
         
-        pages = (total + pagination.size - 1) // pagination.size
+        count_query = select(func.count()).select_from(query.subquery())
         
-        return ResponseModel(
-            message="API configurations retrieved successfully",
-            data={
-                "api_configs": [
-                    {
-                        "id": config.id,
-                        "name": config.name,
-                        "description": config.description,
-                        "lender_id": config.lender_id,
-                        "lender_name": config.lender.name if config.lender else None,
-                        "endpoint_path": config.endpoint_path,
-                        "method": config.method,
-                        "is_active": config.is_active,
-                        "version": config.version,
-                        "created_at": config.created_at
-                    }
-                    for config in api_configs
-                ],
-                "total": total,
-                "page": pagination.page,
-                "size": pagination.size,
-                "pages": pages
-            },
-            pagination=PaginationInfo(
-                page=pagination.page,
-                size=pagination.size,
-                total=total,
-                pages=pages,
-                has_next=pagination.page < pages,
-                has_prev=pagination.page > 1
-            )
+        # Rows are encoded straight from the mappings, skipping the ResponseModel round-trip
+        return Response(
+            content=await _render_api_configs(page_query, count_query, pagination),
+            media_type="application/json"
         )
         
     except Exception as e:
@@ -157,12 +175,41 @@ async def get_api_configs(
 @router.get("/{config_id}", response_model=ResponseModel)
 async def get_api_config(
     config_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated columns to return, e.g. id,name,method"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific API configuration"""
     try:
+        if fields:
+            # Project only the requested columns, skipping the JSON blobs
+            requested = {field.strip() for field in fields.split(",")}
+            columns = [
+                column for column in APIConfig.__table__.columns
+                if column.name in requested
+            ]
+            if not columns:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No valid fields requested"
+                )
+            
+            row = (await db.execute(
+                select(*columns).where(APIConfig.id == config_id)
+            )).mappings().first()
+            
+            if not row:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"API configuration with ID {config_id} not found"
+                )
+            
+            return ResponseModel(
+                message="API configuration retrieved successfully",
+                data=dict(row)
+            )
+        
         result = await db.execute(
-            select(APIConfig).options(selectinload(APIConfig.lender)).where(APIConfig.id == config_id)
+            select(APIConfig).options(joinedload(APIConfig.lender)).where(APIConfig.id == config_id)
         )
         api_config = result.scalar_one_or_none()
         
@@ -218,15 +265,21 @@ async def get_api_config(
 @router.put("/{config_id}", response_model=ResponseModel)
 async def update_api_config(
     config_id: int,
-    api_config_data: dict,
+    api_config_data: APIConfigUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Update an API configuration"""
     try:
+        # Single UPDATE ... RETURNING of only the fields the client sent
+        values = api_config_data.model_dump(exclude_unset=True)
         result = await db.execute(
-            select(APIConfig).where(APIConfig.id == config_id)
+            update(APIConfig)
+            .where(APIConfig.id == config_id)
+            .values(updated_at=func.now(), **values)
+            .returning(APIConfig.id, APIConfig.name, APIConfig.lender_id)
+            .execution_options(synchronize_session=False)
         )
-        api_config = result.scalar_one_or_none()
+        api_config = result.first()
         
         if not api_config:
             raise HTTPException(
@@ -234,13 +287,7 @@ async def update_api_config(
                 detail=f"API configuration with ID {config_id} not found"
             )
         
-        # Update fields
-        for field, value in api_config_data.items():
-            if hasattr(api_config, field):
-                setattr(api_config, field, value)
-        
         await db.commit()
-        await db.refresh(api_config)
         
         logger.info("API config updated successfully", config_id=config_id)
         
@@ -271,19 +318,27 @@ async def delete_api_config(
 ):
     """Delete an API configuration"""
     try:
+        # Core DELETE bypasses the ORM cascade, so remove dependent tests first
+        await db.execute(
+            delete(APITest)
+            .where(APITest.api_config_id == config_id)
+            .execution_options(synchronize_session=False)
+        )
         result = await db.execute(
-            select(APIConfig).where(APIConfig.id == config_id)
+            delete(APIConfig)
+            .where(APIConfig.id == config_id)
+            .returning(APIConfig.id)
+            .execution_options(synchronize_session=False)
         )
-        api_config = result.scalar_one_or_none()
         
-        if not api_config:
+        if result.scalar_one_or_none() is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"API configuration with ID {config_id} not found"
             )
         
-        await db.delete(api_config)
         await db.commit()
+        await invalidate_namespace(API_TESTS_COUNT_PREFIX)
         
         logger.info("API config deleted successfully", config_id=config_id)
         
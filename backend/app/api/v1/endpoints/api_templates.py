@@ -1,41 +1,62 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, delete, tuple_, lambda_stmt
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import undefer
 from typing import Optional
+import asyncio
 import structlog
 
-from ....core.database import get_db
+from ....core.database import get_db, fetch_scalar, fetch_scalars, fetch_mappings
+from ....core.pagination import encode_cursor, decode_cursor
+from ....core.cache import API_TEMPLATES_COUNT_PREFIX, cache_get, cache_set, cache_delete, cached_count, invalidate_namespace
 from ....models.api_template import APITemplate
 from ....schemas.common import ResponseModel, PaginationParams, PaginationInfo
+from ....schemas.api_template import APITemplateCreate, APITemplateUpdate
 
 logger = structlog.get_logger()
 router = APIRouter()
 
+# Redis key and TTL for the distinct category list
+CATEGORIES_CACHE_KEY = "api_templates:categories"
+CATEGORIES_CACHE_TTL = 60
+
+# Postgres SQLSTATE raised when a template name collides with the unique index
+UNIQUE_VIOLATION = "23505"
+
+
+async def _invalidate_caches() -> None:
+    """Drop cached listing totals and categories after a template write"""
+    await invalidate_namespace(API_TEMPLATES_COUNT_PREFIX)
+    await cache_delete(CATEGORIES_CACHE_KEY)
+
 
 @router.post("/", response_model=ResponseModel, status_code=status.HTTP_201_CREATED)
 async def create_api_template(
-    template_data: dict,
+    template_data: APITemplateCreate,
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new API template"""
     try:
-        # Check if template with same name already exists
-        name = template_data.get("name")
-        if name:
-            existing_template = await db.execute(
-                select(APITemplate).where(APITemplate.name == name)
+        # The unique index on name rejects duplicates within the INSERT itself
+        result = await db.execute(
+            insert(APITemplate)
+            .values(**template_data.model_dump())
+            .on_conflict_do_nothing(index_elements=[APITemplate.name])
+            .returning(APITemplate.id, APITemplate.name, APITemplate.template_type, APITemplate.category)
+        )
+        template = result.first()
+        
+        if template is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Template with name '{template_data.name}' already exists"
             )
-            if existing_template.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Template with name '{name}' already exists"
-                )
         
-        # Create template
-        template = APITemplate(**template_data)
-        db.add(template)
         await db.commit()
-        await db.refresh(template)
+        await _invalidate_caches()
         
         logger.info("API template created successfully", template_id=template.id, template_name=template.name)
         
@@ -67,31 +88,53 @@ async def get_api_templates(
     template_type: Optional[str] = Query(None, description="Filter by template type"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     is_system_template: Optional[bool] = Query(None, description="Filter by system template"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Resume after the row encoded by a previous next_cursor")
 ):
     """Get paginated list of API templates"""
     try:
-        query = select(APITemplate)
+        if cursor and pagination.sort_by:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor can only be used with the default ordering"
+            )
+        
+        conditions = []
         
         if category:
-            query = query.where(APITemplate.category == category)
+            conditions.append(APITemplate.category == category)
         
         if template_type:
-            query = query.where(APITemplate.template_type == template_type)
+            conditions.append(APITemplate.template_type == template_type)
         
         if is_active is not None:
-            query = query.where(APITemplate.is_active == is_active)
+            conditions.append(APITemplate.is_active == is_active)
         
         if is_system_template is not None:
-            query = query.where(APITemplate.is_system_template == is_system_template)
-        
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query)
-        
-        # Apply pagination
-        offset = (pagination.page - 1) * pagination.size
-        query = query.offset(offset).limit(pagination.size)
+            conditions.append(APITemplate.is_system_template == is_system_template)
+        
+        # Core projection of the listed columns, returned as plain dicts
+        query = select(
+            APITemplate.id, APITemplate.name, APITemplate.description, APITemplate.category,
+            APITemplate.template_type, APITemplate.file_extension, APITemplate.is_system_template,
+            APITemplate.is_active, APITemplate.version, APITemplate.usage_count,
+            APITemplate.last_used_at, APITemplate.created_at
+        ).where(*conditions)
+        
+        # Get total count straight off the table, no derived subquery
+        count_query = select(func.count(APITemplate.id)).where(*conditions)
+        
+        # Apply pagination, seeking past the cursor row instead of scanning an offset.
+        # One extra row tells whether another page follows
+        if cursor:
+            try:
+                last_created_at, last_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            query = query.where(tuple_(APITemplate.created_at, APITemplate.id) < (last_created_at, last_id))
+        else:
+            offset = (pagination.page - 1) * pagination.size
+            query = query.offset(offset)
+        query = query.limit(pagination.size + 1)
         
         # Apply sorting
         if pagination.sort_by:
@@ -100,48 +143,49 @@ async def get_api_templates(
                 sort_column = sort_column.desc()
             query = query.order_by(sort_column)
         else:
-            query = query.order_by(APITemplate.created_at.desc())
+            query = query.order_by(APITemplate.created_at.desc(), APITemplate.id.desc())
         
-        result = await db.execute(query)
-        templates = result.scalars().all()
+        # Paging through one filter set reuses the cached total
+        count_key = (category, template_type, is_active, is_system_template)
+        
+        # Count and page run concurrently on separate sessions
+        total, templates = await asyncio.gather(
+            cached_count(API_TEMPLATES_COUNT_PREFIX, count_key, lambda: fetch_scalar(count_query)),
+            fetch_mappings(query)
+        )
+        
+        has_more = len(templates) > pagination.size
+        templates = templates[:pagination.size]
         
         pages = (total + pagination.size - 1) // pagination.size
         
+        # In the default ordering the next page can be fetched by keyset
+        next_cursor = None
+        if not pagination.sort_by and has_more:
+            next_cursor = encode_cursor(templates[-1]["created_at"], templates[-1]["id"])
+        
         return ResponseModel(
             message="API templates retrieved successfully",
             data={
-                "templates": [
-                    {
-                        "id": template.id,
-                        "name": template.name,
-                        "description": template.description,
-                        "category": template.category,
-                        "template_type": template.template_type,
-                        "file_extension": template.file_extension,
-                        "is_system_template": template.is_system_template,
-                        "is_active": template.is_active,
-                        "version": template.version,
-                        "usage_count": template.usage_count,
-                        "last_used_at": template.last_used_at,
-                        "created_at": template.created_at
-                    }
-                    for template in templates
-                ],
+                "templates": templates,
                 "total": total,
                 "page": pagination.page,
                 "size": pagination.size,
-                "pages": pages
+                "pages": pages,
+                "next_cursor": next_cursor
             },
             pagination=PaginationInfo(
                 page=pagination.page,
                 size=pagination.size,
                 total=total,
                 pages=pages,
-                has_next=pagination.page < pages,
-                has_prev=pagination.page > 1
+                has_next=has_more,
+                has_prev=bool(cursor) or pagination.page > 1
             )
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to retrieve API templates", error=str(e))
         raise HTTPException(
@@ -150,6 +194,31 @@ async def get_api_templates(
         )
 
 
+@router.get("/categories", response_model=ResponseModel)
+async def get_template_categories():
+    """Get list of available template categories"""
+    try:
+        # Serve the DISTINCT scan from Redis; template writes drop the entry
+        categories = await cache_get(CATEGORIES_CACHE_KEY)
+        if categories is None:
+            categories = await fetch_scalars(
+                select(APITemplate.category).distinct().where(APITemplate.category.isnot(None))
+            )
+            await cache_set(CATEGORIES_CACHE_KEY, categories, CATEGORIES_CACHE_TTL)
+        
+        return ResponseModel(
+            message="Template categories retrieved successfully",
+            data={"categories": categories}
+        )
+        
+    except Exception as e:
+        logger.error("Failed to retrieve template categories", error=str(e))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve template categories"
+        )
+
+
 @router.get("/{template_id}", response_model=ResponseModel)
 async def get_api_template(
     template_id: int,
@@ -157,8 +226,11 @@ async def get_api_template(
 ):
     """Get a specific API template"""
     try:
+        # lambda_stmt caches the built statement; template_id is bound per call
         result = await db.execute(
-            select(APITemplate).where(APITemplate.id == template_id)
+            lambda_stmt(
+                lambda: select(APITemplate).options(undefer(APITemplate.template_content)).where(APITemplate.id == template_id)
+            )
         )
         template = result.scalar_one_or_none()
         
@@ -204,15 +276,33 @@ async def get_api_template(
 @router.put("/{template_id}", response_model=ResponseModel)
 async def update_api_template(
     template_id: int,
-    template_data: dict,
+    template_data: APITemplateUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Update an API template"""
     try:
-        result = await db.execute(
-            select(APITemplate).where(APITemplate.id == template_id)
-        )
-        template = result.scalar_one_or_none()
+        # Single UPDATE ... RETURNING instead of load, modify, commit, refresh
+        values = template_data.model_dump(exclude_unset=True)
+        values["updated_at"] = func.now()
+        
+        # A renamed template colliding with another is caught by the unique index
+        try:
+            result = await db.execute(
+                update(APITemplate)
+                .where(APITemplate.id == template_id)
+                .values(**values)
+                .returning(APITemplate.id, APITemplate.name, APITemplate.template_type)
+                .execution_options(synchronize_session=False)
+            )
+        except IntegrityError as e:
+            await db.rollback()
+            if getattr(e.orig, "sqlstate", None) == UNIQUE_VIOLATION:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Template with name '{template_data.name}' already exists"
+                )
+            raise
+        template = result.first()
         
         if not template:
             raise HTTPException(
@@ -220,24 +310,8 @@ async def update_api_template(
                 detail=f"API template with ID {template_id} not found"
             )
         
-        # Check for name conflict if name is being updated
-        if "name" in template_data and template_data["name"] != template.name:
-            existing_template = await db.execute(
-                select(APITemplate).where(APITemplate.name == template_data["name"])
-            )
-            if existing_template.scalar_one_or_none():
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f"Template with name '{template_data['name']}' already exists"
-                )
-        
-        # Update fields
-        for field, value in template_data.items():
-            if hasattr(template, field):
-                setattr(template, field, value)
-        
         await db.commit()
-        await db.refresh(template)
+        await _invalidate_caches()
         
         logger.info("API template updated successfully", template_id=template_id)
         
@@ -268,26 +342,28 @@ async def delete_api_template(
 ):
     """Delete an API template"""
     try:
+        # Only the system flag is needed to decide, not the whole row
         result = await db.execute(
-            select(APITemplate).where(APITemplate.id == template_id)
+            lambda_stmt(lambda: select(APITemplate.is_system_template).where(APITemplate.id == template_id))
         )
-        template = result.scalar_one_or_none()
+        is_system_template = result.one_or_none()
         
-        if not template:
+        if is_system_template is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"API template with ID {template_id} not found"
             )
         
         # Prevent deletion of system templates
-        if template.is_system_template:
+        if is_system_template[0]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete system templates"
             )
         
-        await db.delete(template)
+        await db.execute(delete(APITemplate).where(APITemplate.id == template_id))
         await db.commit()
+        await _invalidate_caches()
         
         logger.info("API template deleted successfully", template_id=template_id)
         
@@ -305,24 +381,3 @@ async def delete_api_template(
             detail="Failed to delete API template"
         )
 
-
-@router.get("/categories", response_model=ResponseModel)
-async def get_template_categories(db: AsyncSession = Depends(get_db)):
-    """Get list of available template categories"""
-    try:
-        result = await db.execute(
-            select(APITemplate.category).distinct().where(APITemplate.category.isnot(None))
-        )
-        categories = [row[0] for row in result.fetchall()]
-        
-        return ResponseModel(
-            message="Template categories retrieved successfully",
-            data={"categories": categories}
-        )
-        
-    except Exception as e:
-        logger.error("Failed to retrieve template categories", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve template categories"
-        )
@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, insert, update, exists, lambda_stmt
+from sqlalchemy.orm import selectinload, undefer_group
 from typing import Optional
+import asyncio
 import structlog
 
-from ....core.database import get_db
+from ....core.database import get_db, fetch_scalar, fetch_mappings
+from ....core.cache import API_TESTS_COUNT_PREFIX, cached_count, invalidate_namespace
 from ....models.api_test import APITest
 from ....models.api_config import APIConfig
 from ....schemas.common import ResponseModel, PaginationParams, PaginationInfo
+from ....schemas.api_test import APITestCreate, APITestUpdate
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -16,35 +19,34 @@ router = APIRouter()
 
 @router.post("/", response_model=ResponseModel, status_code=status.HTTP_201_CREATED)
 async def create_api_test(
-    test_data: dict,
+    test_data: APITestCreate,
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new API test"""
     try:
         # Validate API config exists
-        api_config_id = test_data.get("api_config_id")
-        if not api_config_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="api_config_id is required"
-            )
+        api_config_id = test_data.api_config_id
         
-        config_result = await db.execute(
-            select(APIConfig).where(APIConfig.id == api_config_id)
+        # EXISTS answers from the primary key index without loading the config row
+        config_exists = await db.scalar(
+            select(exists().where(APIConfig.id == api_config_id))
         )
-        api_config = config_result.scalar_one_or_none()
         
-        if not api_config:
+        if not config_exists:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"API configuration with ID {api_config_id} not found"
             )
         
-        # Create test
-        api_test = APITest(**test_data)
-        db.add(api_test)
+        # Create test, reading the response fields back from the INSERT
+        result = await db.execute(
+            insert(APITest)
+            .values(**test_data.model_dump())
+            .returning(APITest.id, APITest.name, APITest.api_config_id, APITest.test_type)
+        )
+        api_test = result.one()
         await db.commit()
-        await db.refresh(api_test)
+        await invalidate_namespace(API_TESTS_COUNT_PREFIX)
         
         logger.info("API test created successfully", test_id=api_test.id, api_config_id=api_config_id)
         
@@ -75,28 +77,38 @@ async def get_api_tests(
     api_config_id: Optional[int] = Query(None, description="Filter by API config ID"),
     test_type: Optional[str] = Query(None, description="Filter by test type"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
-    environment: Optional[str] = Query(None, description="Filter by environment"),
-    db: AsyncSession = Depends(get_db)
+    environment: Optional[str] = Query(None, description="Filter by environment")
 ):
     """Get paginated list of API tests"""
     try:
-        query = select(APITest).options(selectinload(APITest.api_config))
+        conditions = []
         
         if api_config_id:
-            query = query.where(APITest.api_config_id == api_config_id)
+            conditions.append(APITest.api_config_id == api_config_id)
         
         if test_type:
-            query = query.where(APITest.test_type == test_type)
+            conditions.append(APITest.test_type == test_type)
         
         if is_active is not None:
-            query = query.where(APITest.is_active == is_active)
+            conditions.append(APITest.is_active == is_active)
         
         if environment:
-            query = query.where(APITest.environment == environment)
+            conditions.append(APITest.environment == environment)
+        
+        # Core projection joined to the config name, returned as plain dicts
+        query = (
+            select(
+                APITest.id, APITest.name, APITest.description, APITest.api_config_id,
+                APIConfig.name.label("api_config_name"), APITest.test_type, APITest.is_active,
+                APITest.is_automated, APITest.last_run_status, APITest.last_run_duration,
+                APITest.success_rate, APITest.environment, APITest.created_at
+            )
+            .outerjoin(APIConfig, APIConfig.id == APITest.api_config_id)
+            .where(*conditions)
+        )
         
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query)
+        # Get total count straight off the table, no derived subquery or eager load
+        count_query = select(func.count(APITest.id)).where(*conditions)
         
         # Apply pagination
         offset = (pagination.page - 1) * pagination.size
@@ -111,32 +123,21 @@ async def get_api_tests(
         else:
             query = query.order_by(APITest.created_at.desc())
         
-        result = await db.execute(query)
-        api_tests = result.scalars().all()
+        # Paging through one filter set reuses the cached total
+        count_key = (api_config_id, test_type, is_active, environment)
+        
+        # Count and page run concurrently on separate sessions
+        total, api_tests = await asyncio.gather(
+            cached_count(API_TESTS_COUNT_PREFIX, count_key, lambda: fetch_scalar(count_query)),
+            fetch_mappings(query)
+        )
         
         pages = (total + pagination.size - 1) // pagination.size
         
         return ResponseModel(
             message="API tests retrieved successfully",
             data={
-                "api_tests": [
-                    {
-                        "id": test.id,
-                        "name": test.name,
-                        "description": test.description,
-                        "api_config_id": test.api_config_id,
-                        "api_config_name": test.api_config.name if test.api_config else None,
-                        "test_type": test.test_type,
-                        "is_active": test.is_active,
-                        "is_automated": test.is_automated,
-                        "last_run_status": test.last_run_status,
-                        "last_run_duration": test.last_run_duration,
-                        "success_rate": test.success_rate,
-                        "environment": test.environment,
-                        "created_at": test.created_at
-                    }
-                    for test in api_tests
-                ],
+                "api_tests": api_tests,
                 "total": total,
                 "page": pagination.page,
                 "size": pagination.size,
@@ -167,8 +168,13 @@ async def get_api_test(
 ):
     """Get a specific API test"""
     try:
+        # lambda_stmt caches the built statement; test_id is bound per call
         result = await db.execute(
-            select(APITest).options(selectinload(APITest.api_config)).where(APITest.id == test_id)
+            lambda_stmt(
+                lambda: select(APITest)
+                .options(selectinload(APITest.api_config), undefer_group("payload"))
+                .where(APITest.id == test_id)
+            )
         )
         api_test = result.scalar_one_or_none()
         
@@ -226,15 +232,23 @@ async def get_api_test(
 @router.put("/{test_id}", response_model=ResponseModel)
 async def update_api_test(
     test_id: int,
-    test_data: dict,
+    test_data: APITestUpdate,
     db: AsyncSession = Depends(get_db)
 ):
     """Update an API test"""
     try:
+        # Single UPDATE ... RETURNING instead of load, modify, commit, refresh
+        values = test_data.model_dump(exclude_unset=True)
+        values["updated_at"] = func.now()
+        
         result = await db.execute(
-            select(APITest).where(APITest.id == test_id)
+            update(APITest)
+            .where(APITest.id == test_id)
+            .values(**values)
+            .returning(APITest.id, APITest.name, APITest.api_config_id)
+            .execution_options(synchronize_session=False)
         )
-        api_test = result.scalar_one_or_none()
+        api_test = result.first()
         
         if not api_test:
             raise HTTPException(
@@ -242,13 +256,8 @@ async def update_api_test(
                 detail=f"API test with ID {test_id} not found"
             )
         
-        # Update fields
-        for field, value in test_data.items():
-            if hasattr(api_test, field):
-                setattr(api_test, field, value)
-        
         await db.commit()
-        await db.refresh(api_test)
+        await invalidate_namespace(API_TESTS_COUNT_PREFIX)
         
         logger.info("API test updated successfully", test_id=test_id)
         
@@ -280,7 +289,7 @@ async def delete_api_test(
     """Delete an API test"""
     try:
         result = await db.execute(
-            select(APITest).where(APITest.id == test_id)
+            lambda_stmt(lambda: select(APITest).where(APITest.id == test_id))
         )
         api_test = result.scalar_one_or_none()
         
@@ -292,6 +301,7 @@ async def delete_api_test(
         
         await db.delete(api_test)
         await db.commit()
+        await invalidate_namespace(API_TESTS_COUNT_PREFIX)
         
         logger.info("API test deleted successfully", test_id=test_id)
         
@@ -317,10 +327,33 @@ async def run_api_test(
 ):
     """Run an API test"""
     try:
+        # TODO: Implement actual test execution logic
+        # This would involve making HTTP requests to the API endpoint
+        # and validating the response against expected results
+        
+        # For now, just update the test status. Counters are incremented in SQL
+        # so concurrent runs cannot lose updates, and one UPDATE ... RETURNING
+        # replaces the load-modify-commit round trips.
+        total_runs = func.coalesce(APITest.total_runs, 0) + 1
+        successful_runs = func.coalesce(APITest.successful_runs, 0) + 1  # This would be determined by actual test execution
         result = await db.execute(
-            select(APITest).options(selectinload(APITest.api_config)).where(APITest.id == test_id)
+            update(APITest)
+            .where(APITest.id == test_id)
+            .values(
+                last_run_at=func.now(),
+                last_run_status="passed",  # This would be determined by actual test execution
+                last_run_duration=100,  # milliseconds
+                total_runs=total_runs,
+                successful_runs=successful_runs,
+                success_rate=successful_runs * 100 / total_runs
+            )
+            .returning(
+                APITest.id, APITest.name, APITest.last_run_status,
+                APITest.last_run_duration, APITest.success_rate
+            )
+            .execution_options(synchronize_session=False)
         )
-        api_test = result.scalar_one_or_none()
+        api_test = result.first()
         
         if not api_test:
             raise HTTPException(
@@ -328,22 +361,6 @@ async def run_api_test(
                 detail=f"API test with ID {test_id} not found"
             )
         
-        # TODO: Implement actual test execution logic
-        # This would involve making HTTP requests to the API endpoint
-        # and validating the response against expected results
-        
-        # For now, just update the test status
-        import time
-        api_test.last_run_at = time.time()
-        api_test.last_run_status = "passed"  # This would be determined by actual test execution
-        api_test.last_run_duration = 100  # milliseconds
-        api_test.total_runs += 1
-        api_test.successful_runs += 1
-        
-        # Calculate success rate
-        if api_test.total_runs > 0:
-            api_test.success_rate = (api_test.successful_runs / api_test.total_runs) * 100
-        
         await db.commit()
         
         logger.info("API test executed successfully", test_id=test_id)
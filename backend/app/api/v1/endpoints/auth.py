@@ -1,24 +1,29 @@
+import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm, HTTPAuthorizationCredentials, HTTPBearer
-from jose import jwt, JWTError
+import jwt
+from passlib.context import CryptContext
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
 from ....core.config import settings
 from ....core.database import get_db
 from ....models.user import User
+from ....services.login_recorder import login_recorder
 
 
 router = APIRouter()
 security = HTTPBearer(auto_error=False)
 
+# Built once; constructing a CryptContext per call re-parses its config
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 
 def _verify_password(plain_password: str, hashed_password: str) -> bool:
-    from passlib.context import CryptContext
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     return pwd_context.verify(plain_password, hashed_password)
 
 
@@ -30,6 +35,29 @@ def _create_access_token(data: dict, expires_delta: Optional[timedelta] = None)
     return encoded_jwt
 
 
+# Verified token payloads, kept briefly so repeat requests with the same bearer
+# token skip the signature check. The short TTL bounds how long a payload
+# outlives a rotated secret
+TOKEN_CACHE_TTL = 60
+TOKEN_CACHE_MAXSIZE = 4096
+_token_cache: Dict[str, Tuple[float, dict]] = {}
+
+
+def _decode_token(token: str) -> dict:
+    now = time.time()
+    cached = _token_cache.get(token)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    if len(_token_cache) >= TOKEN_CACHE_MAXSIZE:
+        # Evict the oldest insertion
+        _token_cache.pop(next(iter(_token_cache)))
+    # Never keep a payload past its own expiry
+    _token_cache[token] = (min(now + TOKEN_CACHE_TTL, payload.get("exp", now)), payload)
+    return payload
+
+
 async def get_current_user(
     creds: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: AsyncSession = Depends(get_db),
@@ -38,13 +66,12 @@ async def get_current_user(
         return None
     token = creds.credentials
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = _decode_token(token)
         user_id = payload.get("sub")
         if not user_id:
             return None
-        result = await db.execute(select(User).where(User.id == int(user_id)))
-        return result.scalar_one_or_none()
-    except JWTError:
+        return await db.get(User, int(user_id))
+    except jwt.PyJWTError:
         return None
 
 
@@ -55,12 +82,15 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
         select(User).where((User.email == form_data.username) | (User.username == form_data.username))
     )
     user = result.scalar_one_or_none()
-    if not user or not user.hashed_password or not _verify_password(form_data.password, user.hashed_password):
+    # bcrypt is CPU-bound; verify on a worker thread so the event loop keeps serving
+    if not user or not user.hashed_password or not await asyncio.to_thread(
+        _verify_password, form_data.password, user.hashed_password
+    ):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect username or password")
 
     token = _create_access_token({"sub": str(user.id)})
-    user.last_login_at = datetime.utcnow()
-    await db.commit()
+    # last_login_at is written by the recorder's next batched UPDATE, off the response path
+    login_recorder.record(user.id, datetime.utcnow())
     return {"access_token": token, "token_type": "bearer", "user": {"id": user.id, "email": user.email, "username": user.username}}
 
 
@@ -1,77 +1,317 @@
-from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from typing import AsyncIterator, List, Optional, Dict, Any, Tuple
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import exists, insert, select, update
+import asyncio
+import contextlib
+import hashlib
 import os
-import zipfile
+import shutil
 import tempfile
 import datetime
 import uuid
 from pathlib import Path
+import orjson
 
+from ....core.config import settings
+from ....core.cache import cache_set, get_redis
 from ....core.database import get_db
-from ....models.generated_api import GeneratedAPI
+from ....core.streaming import dumps, close_envelope, zip_directory, write_zip, tree_mtime, tree_size
 from ....models.lender import Lender
 from ....models.deployed_api import DeployedAPI, DeployedIntegration
 from ....schemas.common import ResponseModel, PaginationParams
 from ....services.deployment_generator import DeploymentGenerator
 from ....services.api_generator import APIGenerator
+from ....services.generated_api_cache import get_cached_generated_api, invalidate_generated_api
 import structlog
 
 logger = structlog.get_logger()
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+# Directory name prefix per deployment kind under GENERATED_APIS_DIR; docker,
+# kubernetes and serverless packages are all written to the "deployment" one
+_DEPLOYMENT_DIR_PREFIXES = {
+    "docker": "deployment",
+    "kubernetes": "k8s_deployment",
+    "helm": "helm-chart"
+}
 
-@router.post("/generate-deployment")
+# Full path template per kind, resolved once; only the id is filled in per request
+_DEPLOYMENT_DIR_TEMPLATES = {
+    kind: f"{settings.GENERATED_APIS_DIR}/{prefix}_%d" for kind, prefix in _DEPLOYMENT_DIR_PREFIXES.items()
+}
+
+
+def _deployment_dir(kind: str, generated_api_id: int) -> str:
+    """Path of a generated API's deployment directory for a kind"""
+    return _DEPLOYMENT_DIR_TEMPLATES[kind] % generated_api_id
+
+
+def _deployment_dirs(generated_api_id: int) -> Dict[str, str]:
+    """Paths of all of a generated API's deployment directories, by kind"""
+    return {kind: template % generated_api_id for kind, template in _DEPLOYMENT_DIR_TEMPLATES.items()}
+
+
+def _deployment_zip_name(generated_api_id: int, deployment_type: str) -> str:
+    """On-disk file name of a cached deployment ZIP under GENERATED_APIS_DIR.
+
+    Keyed by id, not the API name, so APIs sharing a name never share an
+    archive; the friendly name is only sent in Content-Disposition.
+    """
+    return f"api_{generated_api_id}_{deployment_type}_deployment.zip"
+
+
+def _deployment_zip_paths(generated_api_id: int) -> List[str]:
+    """Paths of every cached deployment ZIP of a generated API on disk"""
+    prefix = f"api_{generated_api_id}_"
+    try:
+        with os.scandir(settings.GENERATED_APIS_DIR) as entries:
+            return [
+                entry.path for entry in entries
+                if entry.name.startswith(prefix) and entry.name.endswith("_deployment.zip")
+            ]
+    except FileNotFoundError:
+        return []
+
+
+async def get_generated_api(generated_api_id: int, db: AsyncSession = Depends(get_db)):
+    """Dependency resolving generated_api_id to its cached projection, 404 if it does not exist"""
+    generated_api = await get_cached_generated_api(db, generated_api_id)
+    if not generated_api:
+        raise HTTPException(status_code=404, detail="Generated API not found")
+    return generated_api
+
+
+async def require_lender(lender_id: int, db: AsyncSession = Depends(get_db)) -> None:
+    """Dependency raising 404 unless lender_id exists, answered from the primary key index"""
+    if not await db.scalar(select(exists().where(Lender.id == lender_id))):
+        raise HTTPException(status_code=404, detail="Lender not found")
+
+
+# Redis namespace and lifetime of deployment generation job states
+DEPLOYMENT_JOB_PREFIX = "deployment_job"
+DEPLOYMENT_JOB_TTL = 86400
+
+# Built deployment ZIPs keyed by (generated_api_id, deployment_type): (zip_path, tree mtime)
+ZIP_CACHE_MAXSIZE = 1024
+_zip_cache: Dict[Tuple[int, str], Tuple[str, float]] = {}
+
+# One lock per ZIP cache key, so concurrent downloads of one archive build it
+# once while different archives build in parallel up to _BUILD_SEMAPHORE.
+# Entries are [lock, holders + waiters] and go once nobody is using them
+_zip_build_locks: Dict[Tuple[int, str], List[Any]] = {}
+
+# deployment-status results keyed by (generated_api_id, include_files):
+# (deployment directory mtimes, status)
+STATUS_CACHE_MAXSIZE = 1024
+_status_cache: Dict[Tuple[int, bool], Tuple[Tuple[Optional[int], ...], Dict[str, Any]]] = {}
+
+# CPU-bound package generation and ZIP builds allowed at once; excess requests
+# queue here instead of each occupying a worker thread and contending for cores
+_BUILD_SEMAPHORE = asyncio.Semaphore(os.cpu_count() or 4)
+
+
+def _zip_freshness(deployment_dir: str, zip_path: str) -> Tuple[float, Optional[os.stat_result]]:
+    """Tree mtime of deployment_dir and the stat of zip_path (None if missing), in one thread hop"""
+    try:
+        zip_stat = os.stat(zip_path)
+    except FileNotFoundError:
+        zip_stat = None
+    return tree_mtime(deployment_dir), zip_stat
+
+
+def _build_zip(deployment_dir: str, zip_path: str, files: Optional[List[Tuple[str, str]]]) -> os.stat_result:
+    """Write the ZIP of deployment_dir and stat the result"""
+    write_zip(deployment_dir, zip_path, files)
+    return os.stat(zip_path)
+
+
+@contextlib.asynccontextmanager
+async def _zip_build_lock(key: Tuple[int, str]) -> AsyncIterator[None]:
+    """Hold the build lock of one ZIP cache key, dropping it when unused"""
+    entry = _zip_build_locks.get(key)
+    if entry is None:
+        entry = _zip_build_locks[key] = [asyncio.Lock(), 0]
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del _zip_build_locks[key]
+
+
+async def _cached_zip(
+    generated_api_id: int,
+    deployment_type: str,
+    deployment_dir: str,
+    zip_path: str,
+    files: Optional[List[Tuple[str, str]]] = None
+) -> os.stat_result:
+    """Ensure zip_path holds a ZIP of deployment_dir, rebuilding it only when the tree has changed.
+
+    Returns the archive's stat so callers can serve it without another stat().
+    """
+    key = (generated_api_id, deployment_type)
+    async with _zip_build_lock(key):
+        mtime, zip_stat = await asyncio.to_thread(_zip_freshness, deployment_dir, zip_path)
+        cached = _zip_cache.get(key)
+        if cached and cached[0] == zip_path and cached[1] == mtime and zip_stat is not None:
+            return zip_stat
+        async with _BUILD_SEMAPHORE:
+            zip_stat = await asyncio.to_thread(_build_zip, deployment_dir, zip_path, files)
+        _zip_cache.pop(key, None)
+        if len(_zip_cache) >= ZIP_CACHE_MAXSIZE:
+            # Evict the oldest insertion; its next download re-checks the tree
+            _zip_cache.pop(next(iter(_zip_cache)))
+        _zip_cache[key] = (zip_path, mtime)
+        return zip_stat
+
+
+def _list_deployment_dir(dir_path: str, include_files: bool) -> Optional[Tuple[int, Optional[List[str]]]]:
+    """(entry count, names) of a deployment directory, None if it is missing.
+
+    names is only built when include_files is set; otherwise the entries are
+    just counted. A path that is not a directory counts as empty.
+    """
+    # Let scandir's open() report a missing path or a file instead of stat()ing first
+    try:
+        with os.scandir(dir_path) as entries:
+            if include_files:
+                names = [entry.name for entry in entries]
+                return len(names), names
+            return sum(1 for _ in entries), None
+    except FileNotFoundError:
+        return None
+    except NotADirectoryError:
+        return 0, [] if include_files else None
+
+
+def _dir_mtimes(dir_paths: List[str]) -> Tuple[Optional[int], ...]:
+    """st_mtime_ns of each path, None where the path is missing"""
+    mtimes = []
+    for dir_path in dir_paths:
+        try:
+            mtimes.append(os.stat(dir_path).st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _rmtree_if_exists(dir_path: str) -> bool:
+    """Remove a deployment directory, returning whether it existed"""
+    if not os.path.exists(dir_path):
+        return False
+    shutil.rmtree(dir_path)
+    return True
+
+
+def _remove_if_exists(file_path: str) -> None:
+    """Remove a file, ignoring one that is already gone"""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+async def _create_job(job_id: str, **state: Any) -> None:
+    """Store a new deployment job's state in Redis, raising if it cannot be stored.
+
+    Unlike the later updates, a lost initial write would hand out a job_id
+    that never resolves, so the caller must see the failure.
+    """
+    await get_redis().set(f"{DEPLOYMENT_JOB_PREFIX}:{job_id}", dumps(state), ex=DEPLOYMENT_JOB_TTL)
+
+
+async def _set_job(job_id: str, **state: Any) -> None:
+    """Update a deployment job's state in Redis; failures are logged, not raised"""
+    await cache_set(f"{DEPLOYMENT_JOB_PREFIX}:{job_id}", state, DEPLOYMENT_JOB_TTL)
+
+
+async def _run_generation(
+    job_id: str,
+    generated_api: Any,
+    deployment_type: str,
+    config: Dict[str, Any]
+) -> None:
+    """Background task: generate the deployment package and record the outcome on the job"""
+    job = {"generated_api_id": generated_api.id, "deployment_type": deployment_type}
+    await _set_job(job_id, status="running", **job)
+    try:
+        async with _BUILD_SEMAPHORE:
+            deployment_info = await DeploymentGenerator().generate_deployment_package(
+                generated_api=generated_api,
+                deployment_type=deployment_type,
+                config=config
+            )
+        await _set_job(
+            job_id,
+            status="done",
+            deployment_dir=deployment_info["deployment_dir"],
+            files=deployment_info["files"],
+            **job
+        )
+        logger.info(
+            "Deployment package generated successfully",
+            job_id=job_id,
+            generated_api_id=generated_api.id,
+            deployment_type=deployment_type,
+            deployment_dir=deployment_info["deployment_dir"]
+        )
+    except Exception as e:
+        await _set_job(job_id, status="failed", error=str(e), **job)
+        logger.error(
+            "Failed to generate deployment package",
+            job_id=job_id,
+            generated_api_id=generated_api.id,
+            error=str(e)
+        )
+
+
+@router.post("/generate-deployment", status_code=202)
 async def generate_deployment_package(
     generated_api_id: int,
+    background_tasks: BackgroundTasks,
     deployment_type: str = "docker",
     config: Optional[Dict[str, Any]] = None,
-    background_tasks: BackgroundTasks = None,
-    db: AsyncSession = Depends(get_db)
+    generated_api: Any = Depends(get_generated_api)
 ):
-    """Generate deployment package for a generated API"""
+    """Queue deployment package generation for a generated API"""
     try:
-        # Get the generated API
-        result = await db.execute(
-            select(GeneratedAPI).where(GeneratedAPI.id == generated_api_id)
-        )
-        generated_api = result.scalar_one_or_none()
-        
-        if not generated_api:
-            raise HTTPException(status_code=404, detail="Generated API not found")
-        
-        # Initialize deployment generator
-        deployment_gen = DeploymentGenerator()
-        
-        # Generate deployment package
-        deployment_info = await deployment_gen.generate_deployment_package(
-            generated_api=generated_api,
-            deployment_type=deployment_type,
-            config=config or {}
-        )
+        # Generation runs after the response; poll /deployment-job/{job_id} for the result
+        job_id = uuid.uuid4().hex
+        try:
+            await _create_job(job_id, status="queued", generated_api_id=generated_api_id, deployment_type=deployment_type)
+        except Exception as e:
+            logger.error("Failed to record deployment job", generated_api_id=generated_api_id, error=str(e))
+            raise HTTPException(status_code=503, detail="Deployment job store is unavailable")
+        background_tasks.add_task(_run_generation, job_id, generated_api, deployment_type, config or {})
         
         logger.info(
-            "Deployment package generated successfully",
+            "Deployment package generation queued",
+            job_id=job_id,
             generated_api_id=generated_api_id,
-            deployment_type=deployment_type,
-            deployment_dir=deployment_info["deployment_dir"]
+            deployment_type=deployment_type
         )
         
         return ResponseModel(
             success=True,
-            message="Deployment package generated successfully",
+            message="Deployment package generation queued",
             data={
-                "deployment_dir": deployment_info["deployment_dir"],
-                "files": deployment_info["files"],
+                "job_id": job_id,
+                "status": "queued",
                 "generated_api_id": generated_api_id,
                 "deployment_type": deployment_type
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
-            "Failed to generate deployment package",
+            "Failed to queue deployment package generation",
             generated_api_id=generated_api_id,
             error=str(e)
         )
@@ -81,58 +321,93 @@ async def generate_deployment_package(
         )
 
 
+@router.get("/deployment-job/{job_id}")
+async def get_deployment_job(job_id: str):
+    """Get the state of a queued deployment generation job"""
+    # Read Redis directly: an outage must not look like an unknown job
+    try:
+        raw = await get_redis().get(f"{DEPLOYMENT_JOB_PREFIX}:{job_id}")
+    except Exception as e:
+        logger.error("Failed to read deployment job", job_id=job_id, error=str(e))
+        raise HTTPException(status_code=503, detail="Deployment job store is unavailable")
+    job = orjson.loads(raw) if raw is not None else None
+    if job is None:
+        raise HTTPException(status_code=404, detail="Deployment job not found")
+    
+    return ResponseModel(
+        success=True,
+        message="Deployment job retrieved successfully",
+        data={"job_id": job_id, **job}
+    )
+
+
 @router.get("/download-deployment/{generated_api_id}")
 async def download_deployment_package(
     generated_api_id: int,
     deployment_type: str = "docker",
-    db: AsyncSession = Depends(get_db)
+    resumable: bool = False,
+    generated_api: Any = Depends(get_generated_api)
 ):
     """Download deployment package as ZIP file"""
     try:
-        # Get the generated API
-        result = await db.execute(
-            select(GeneratedAPI).where(GeneratedAPI.id == generated_api_id)
-        )
-        generated_api = result.scalar_one_or_none()
-        
-        if not generated_api:
-            raise HTTPException(status_code=404, detail="Generated API not found")
-        
         # Check if deployment directory exists
-        deployment_dir = os.path.join(
-            "generated_apis",
-            f"deployment_{generated_api_id}"
-        )
+        deployment_dir = _deployment_dir("docker", generated_api_id)
+        
+        # Files to pack; None means walk the existing directory
+        manifest = None
         
-        if not os.path.exists(deployment_dir):
+        if not await asyncio.to_thread(os.path.exists, deployment_dir):
             # Generate deployment package first
             deployment_gen = DeploymentGenerator()
-            deployment_info = await deployment_gen.generate_deployment_package(
-                generated_api=generated_api,
-                deployment_type=deployment_type,
-                config={}
-            )
+            async with _BUILD_SEMAPHORE:
+                deployment_info = await deployment_gen.generate_deployment_package(
+                    generated_api=generated_api,
+                    deployment_type=deployment_type,
+                    config={}
+                )
             deployment_dir = deployment_info["deployment_dir"]
+            # The fresh directory holds exactly what the generator wrote, so skip the walk
+            manifest = [(os.path.join(deployment_dir, name), name) for name in deployment_info["files"]]
         
-        # Create ZIP file
         zip_filename = f"{generated_api.name.lower().replace(' ', '_')}_{deployment_type}_deployment.zip"
-        zip_path = os.path.join("generated_apis", zip_filename)
+        zip_name = _deployment_zip_name(generated_api_id, deployment_type)
+        zip_path = os.path.join(settings.GENERATED_APIS_DIR, zip_name)
+        
+        # Behind nginx, reuse the ZIP until the tree changes and let nginx sendfile() it
+        if settings.USE_X_ACCEL:
+            await _cached_zip(generated_api_id, deployment_type, deployment_dir, zip_path, manifest)
+            return Response(
+                headers={
+                    "X-Accel-Redirect": f"{settings.X_ACCEL_PREFIX}{zip_name}",
+                    "Content-Disposition": f'attachment; filename="{zip_filename}"',
+                    "Content-Type": "application/zip"
+                }
+            )
         
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(deployment_dir):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, deployment_dir)
-                    zipf.write(file_path, arcname)
+        # Resumable downloads need stable bytes across attempts, so serve the cached
+        # ZIP from disk; FileResponse answers Range requests and reuses our stat.
+        # Small trees take the same path: the sized response carries Content-Length
+        # instead of being sent chunked, and repeat downloads skip compression
+        if resumable or await asyncio.to_thread(tree_size, deployment_dir, manifest) <= settings.SMALL_DEPLOYMENT_MAX_BYTES:
+            stat_result = await _cached_zip(generated_api_id, deployment_type, deployment_dir, zip_path, manifest)
+            return FileResponse(
+                path=zip_path,
+                filename=zip_filename,
+                media_type="application/zip",
+                stat_result=stat_result,
+                headers={"Accept-Ranges": "bytes", "Cache-Control": "no-store"}
+            )
         
-        # Return file response
-        from fastapi.responses import FileResponse
-        return FileResponse(
-            path=zip_path,
-            filename=zip_filename,
-            media_type='application/zip'
+        # Otherwise stream the ZIP as it is compressed instead of writing it to disk first
+        return StreamingResponse(
+            # A build slot is taken per compression step, not across network sends
+            zip_directory(deployment_dir, manifest, limiter=_BUILD_SEMAPHORE),
+            media_type='application/zip',
+            headers={"Content-Disposition": f'attachment; filename="{zip_filename}"'}
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Failed to download deployment package",
@@ -149,27 +424,20 @@ async def download_deployment_package(
 async def generate_helm_chart(
     generated_api_id: int,
     config: Optional[Dict[str, Any]] = None,
-    db: AsyncSession = Depends(get_db)
+    generated_api: Any = Depends(get_generated_api)
 ):
     """Generate Helm chart for Kubernetes deployment"""
     try:
-        # Get the generated API
-        result = await db.execute(
-            select(GeneratedAPI).where(GeneratedAPI.id == generated_api_id)
-        )
-        generated_api = result.scalar_one_or_none()
-        
-        if not generated_api:
-            raise HTTPException(status_code=404, detail="Generated API not found")
-        
         # Initialize deployment generator
         deployment_gen = DeploymentGenerator()
         
-        # Generate Helm chart
-        chart_info = deployment_gen.generate_helm_chart(
-            generated_api=generated_api,
-            config=config or {}
-        )
+        # Generate Helm chart on a worker thread; the generator is synchronous
+        async with _BUILD_SEMAPHORE:
+            chart_info = await asyncio.to_thread(
+                deployment_gen.generate_helm_chart,
+                generated_api=generated_api,
+                config=config or {}
+            )
         
         logger.info(
             "Helm chart generated successfully",
@@ -187,6 +455,8 @@ async def generate_helm_chart(
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Failed to generate Helm chart",
@@ -199,155 +469,165 @@ async def generate_helm_chart(
         )
 
 
+# Static deployment template catalogue
+_DEPLOYMENT_TEMPLATES = [
+    {
+        "type": "docker",
+        "name": "Docker & Docker Compose",
+        "description": "Containerized deployment with Docker and Docker Compose",
+        "features": [
+            "Easy local development",
+            "Production-ready containers",
+            "Built-in health checks",
+            "Volume management"
+        ]
+    },
+    {
+        "type": "kubernetes",
+        "name": "Kubernetes",
+        "description": "Kubernetes deployment manifests",
+        "features": [
+            "Scalable deployment",
+            "Service discovery",
+            "ConfigMap and Secret management",
+            "Ingress configuration"
+        ]
+    },
+    {
+        "type": "serverless",
+        "name": "Serverless",
+        "description": "Serverless deployment with AWS Lambda or similar",
+        "features": [
+            "Pay-per-use pricing",
+            "Auto-scaling",
+            "No server management",
+            "Event-driven architecture"
+        ]
+    }
+]
+
+# The catalogue response pre-serialized through its data; close_envelope()
+# appends the errors, pagination and timestamp fields per request
+_DEPLOYMENT_TEMPLATES_PREFIX = (
+    b'{"success":true,"message":' + dumps("Deployment templates retrieved successfully")
+    + b',"data":' + dumps({"templates": _DEPLOYMENT_TEMPLATES})
+)
+
+# The catalogue only changes with a deploy. The ETag is weak because the
+# per-response timestamp differs while the content it validates does not
+_DEPLOYMENT_TEMPLATES_HEADERS = {
+    "ETag": f'W/"{hashlib.md5(_DEPLOYMENT_TEMPLATES_PREFIX).hexdigest()}"',
+    "Cache-Control": "public, max-age=86400"
+}
+
+
 @router.get("/deployment-templates")
-async def get_deployment_templates():
+def get_deployment_templates(request: Request):
     """Get available deployment templates"""
-    templates = [
-        {
-            "type": "docker",
-            "name": "Docker & Docker Compose",
-            "description": "Containerized deployment with Docker and Docker Compose",
-            "features": [
-                "Easy local development",
-                "Production-ready containers",
-                "Built-in health checks",
-                "Volume management"
-            ]
-        },
-        {
-            "type": "kubernetes",
-            "name": "Kubernetes",
-            "description": "Kubernetes deployment manifests",
-            "features": [
-                "Scalable deployment",
-                "Service discovery",
-                "ConfigMap and Secret management",
-                "Ingress configuration"
-            ]
-        },
-        {
-            "type": "serverless",
-            "name": "Serverless",
-            "description": "Serverless deployment with AWS Lambda or similar",
-            "features": [
-                "Pay-per-use pricing",
-                "Auto-scaling",
-                "No server management",
-                "Event-driven architecture"
-            ]
-        }
-    ]
+    if request.headers.get("if-none-match") == _DEPLOYMENT_TEMPLATES_HEADERS["ETag"]:
+        return Response(status_code=304, headers=_DEPLOYMENT_TEMPLATES_HEADERS)
     
-    return ResponseModel(
-        success=True,
-        message="Deployment templates retrieved successfully",
-        data={"templates": templates}
+    return Response(
+        content=_DEPLOYMENT_TEMPLATES_PREFIX + close_envelope(),
+        media_type="application/json",
+        headers=_DEPLOYMENT_TEMPLATES_HEADERS
     )
 
 
-@router.get("/deployment-status/{generated_api_id}")
+@router.get("/deployment-status/{generated_api_id}", dependencies=[Depends(get_generated_api)])
 async def get_deployment_status(
     generated_api_id: int,
-    db: AsyncSession = Depends(get_db)
+    include_files: bool = False
 ):
     """Get deployment status for a generated API"""
-    try:
-        # Get the generated API
-        result = await db.execute(
-            select(GeneratedAPI).where(GeneratedAPI.id == generated_api_id)
+    # Check deployment directories
+    deployment_dirs = _deployment_dirs(generated_api_id)
+    
+    # Directory mtimes move whenever an entry is added or removed, so an unchanged
+    # signature means the cached listing is still accurate. Taken before listing,
+    # so a change racing the scan only causes a recompute on the next poll
+    signature = await asyncio.to_thread(_dir_mtimes, list(deployment_dirs.values()))
+    cache_key = (generated_api_id, include_files)
+    cached = _status_cache.get(cache_key)
+    
+    if cached and cached[0] == signature:
+        status = cached[1]
+    else:
+        # Check all three directories concurrently on worker threads
+        listings = await asyncio.gather(
+            *(asyncio.to_thread(_list_deployment_dir, dir_path, include_files) for dir_path in deployment_dirs.values())
         )
-        generated_api = result.scalar_one_or_none()
-        
-        if not generated_api:
-            raise HTTPException(status_code=404, detail="Generated API not found")
-        
-        # Check deployment directories
-        deployment_dirs = {
-            "docker": os.path.join("generated_apis", f"deployment_{generated_api_id}"),
-            "kubernetes": os.path.join("generated_apis", f"k8s_deployment_{generated_api_id}"),
-            "helm": os.path.join("generated_apis", f"helm-chart_{generated_api_id}")
-        }
         
+        # File names are only listed on request; polling just needs the counts
         status = {}
-        for deployment_type, dir_path in deployment_dirs.items():
-            if os.path.exists(dir_path):
-                files = os.listdir(dir_path) if os.path.isdir(dir_path) else []
+        for (deployment_type, dir_path), listing in zip(deployment_dirs.items(), listings):
+            if listing is not None:
+                file_count, files = listing
                 status[deployment_type] = {
                     "available": True,
                     "directory": dir_path,
                     "files": files,
-                    "file_count": len(files)
+                    "file_count": file_count
                 }
             else:
                 status[deployment_type] = {
                     "available": False,
                     "directory": dir_path,
-                    "files": [],
+                    "files": [] if include_files else None,
                     "file_count": 0
                 }
         
-        return ResponseModel(
-            success=True,
-            message="Deployment status retrieved successfully",
-            data={
-                "generated_api_id": generated_api_id,
-                "status": status
-            }
-        )
-        
-    except Exception as e:
-        logger.error(
-            "Failed to get deployment status",
-            generated_api_id=generated_api_id,
-            error=str(e)
-        )
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to get deployment status: {str(e)}"
-        )
+        if len(_status_cache) >= STATUS_CACHE_MAXSIZE:
+            # Evict the oldest insertion
+            _status_cache.pop(next(iter(_status_cache)))
+        _status_cache[cache_key] = (signature, status)
+    
+    return ResponseModel(
+        success=True,
+        message="Deployment status retrieved successfully",
+        data={
+            "generated_api_id": generated_api_id,
+            "status": status
+        }
+    )
 
 
-@router.delete("/cleanup-deployment/{generated_api_id}")
+@router.delete("/cleanup-deployment/{generated_api_id}", dependencies=[Depends(get_generated_api)])
 async def cleanup_deployment_files(
     generated_api_id: int,
-    deployment_type: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    deployment_type: Optional[str] = None
 ):
     """Clean up deployment files for a generated API"""
     try:
-        # Get the generated API
-        result = await db.execute(
-            select(GeneratedAPI).where(GeneratedAPI.id == generated_api_id)
-        )
-        generated_api = result.scalar_one_or_none()
-        
-        if not generated_api:
-            raise HTTPException(status_code=404, detail="Generated API not found")
-        
         # Define deployment directories to clean up
-        deployment_dirs = []
-        
         if deployment_type:
-            if deployment_type == "docker":
-                deployment_dirs.append(os.path.join("generated_apis", f"deployment_{generated_api_id}"))
-            elif deployment_type == "kubernetes":
-                deployment_dirs.append(os.path.join("generated_apis", f"k8s_deployment_{generated_api_id}"))
-            elif deployment_type == "helm":
-                deployment_dirs.append(os.path.join("generated_apis", f"helm-chart_{generated_api_id}"))
+            deployment_dirs = (
+                [_deployment_dir(deployment_type, generated_api_id)]
+                if deployment_type in _DEPLOYMENT_DIR_TEMPLATES else []
+            )
         else:
             # Clean up all deployment types
-            deployment_dirs.extend([
-                os.path.join("generated_apis", f"deployment_{generated_api_id}"),
-                os.path.join("generated_apis", f"k8s_deployment_{generated_api_id}"),
-                os.path.join("generated_apis", f"helm-chart_{generated_api_id}")
-            ])
-        
-        cleaned_dirs = []
-        for dir_path in deployment_dirs:
-            if os.path.exists(dir_path):
-                import shutil
-                shutil.rmtree(dir_path)
-                cleaned_dirs.append(dir_path)
+            deployment_dirs = list(_deployment_dirs(generated_api_id).values())
+        
+        # Cached ZIPs of this API go too; the next download rebuilds from the new tree
+        for key in [key for key in _zip_cache if key[0] == generated_api_id]:
+            if not deployment_type or key[1] == deployment_type:
+                del _zip_cache[key]
+        if deployment_type:
+            stale_zip_paths = [os.path.join(settings.GENERATED_APIS_DIR, _deployment_zip_name(generated_api_id, deployment_type))]
+        else:
+            stale_zip_paths = await asyncio.to_thread(_deployment_zip_paths, generated_api_id)
+        
+        # Removing a tree is blocking disk I/O; remove each on its own worker thread,
+        # alongside the stale archives
+        removed, _ = await asyncio.gather(
+            asyncio.gather(*(asyncio.to_thread(_rmtree_if_exists, dir_path) for dir_path in deployment_dirs)),
+            asyncio.gather(*(asyncio.to_thread(_remove_if_exists, zip_path) for zip_path in stale_zip_paths))
+        )
+        cleaned_dirs = [dir_path for dir_path, was_removed in zip(deployment_dirs, removed) if was_removed]
+        invalidate_generated_api(generated_api_id)
+        _status_cache.pop((generated_api_id, False), None)
+        _status_cache.pop((generated_api_id, True), None)
         
         logger.info(
             "Deployment files cleaned up successfully",
@@ -365,6 +645,8 @@ async def cleanup_deployment_files(
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Failed to cleanup deployment files",
@@ -397,10 +679,11 @@ async def deploy_integration(
     
     try:
         # Get the lender
+        # Only the name is read, so skip loading the whole lender row
         result = await db.execute(
-            select(Lender).where(Lender.id == lender_id)
+            select(Lender.name).where(Lender.id == lender_id)
         )
-        lender = result.scalar_one_or_none()
+        lender = result.one_or_none()
         
         if not lender:
             raise HTTPException(status_code=404, detail="Lender not found")
@@ -410,7 +693,7 @@ async def deploy_integration(
             raise HTTPException(status_code=400, detail="Invalid sequence configuration")
         
         # Generate a unique deployment ID
-        deployment_id = str(uuid.uuid4())
+        deployment_id = uuid.uuid4().hex
         
         # Generate API signature for the integration
         base_url = "http://localhost:8000"  # TODO: Get from config in production
@@ -419,24 +702,28 @@ async def deploy_integration(
         # Generate curl command for the integration
         integration_curl = f"curl -X POST '{full_endpoint_url}' \\\n  -H 'Content-Type: application/json' \\\n  -d '{{}}'"
         
-        # Create deployment record in database
-        deployed_integration = DeployedIntegration(
-            id=deployment_id,
-            lender_id=lender_id,
-            sequence_config=sequence_config,
-            field_mappings=field_mappings,
-            api_signature={
-                "method": "POST",
-                "endpoint": full_endpoint_url,
-                "curl_command": integration_curl,
-                "description": f"Integration sequence for {lender.name} with {len(sequence_config.get('steps', []))} steps",
-                "response_format": "JSON",
-                "authentication": "None"
-            },
-            status="active"
-        )
-        
-        db.add(deployed_integration)
+        steps_count = len(sequence_config.get("steps", []))
+        api_signature = {
+            "method": "POST",
+            "endpoint": full_endpoint_url,
+            "curl_command": integration_curl,
+            "description": f"Integration sequence for {lender.name} with {steps_count} steps",
+            "response_format": "JSON",
+            "authentication": "None"
+        }
+        
+        # Create deployment record in database; the id is ours, so a Core INSERT
+        # needs no unit of work or RETURNING
+        await db.execute(
+            insert(DeployedIntegration).values(
+                id=deployment_id,
+                lender_id=lender_id,
+                sequence_config=sequence_config,
+                field_mappings=field_mappings,
+                api_signature=api_signature,
+                status="active"
+            )
+        )
         await db.commit()
         
         # Create response data
@@ -447,11 +734,11 @@ async def deploy_integration(
             "sequence_config": sequence_config,
             "field_mappings": field_mappings,
             "status": "deployed",
-            "deployed_at": str(datetime.datetime.utcnow()),
+            "deployed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
             "endpoint_url": f"/api/v1/integrations/{deployment_id}",
             "full_endpoint_url": full_endpoint_url,
-            "steps_count": len(sequence_config.get("steps", [])),
-            "api_signature": deployed_integration.api_signature
+            "steps_count": steps_count,
+            "api_signature": api_signature
         }
         
         logger.info(
@@ -467,6 +754,8 @@ async def deploy_integration(
             data=deployment_info
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Failed to deploy integration",
@@ -479,6 +768,10 @@ async def deploy_integration(
         )
 
 
+# HTTP methods whose curl example carries a request body
+_BODY_METHODS = frozenset(("POST", "PUT", "PATCH"))
+
+
 @router.post("/deploy-step-api")
 async def deploy_step_api(
     request: Dict[str, Any],
@@ -500,10 +793,11 @@ async def deploy_step_api(
     
     try:
         # Get the lender
+        # Only the name is read, so skip loading the whole lender row
         result = await db.execute(
-            select(Lender).where(Lender.id == lender_id)
+            select(Lender.name).where(Lender.id == lender_id)
         )
-        lender = result.scalar_one_or_none()
+        lender = result.one_or_none()
         
         if not lender:
             raise HTTPException(status_code=404, detail="Lender not found")
@@ -518,7 +812,7 @@ async def deploy_step_api(
             raise HTTPException(status_code=400, detail="Step configuration must have either 'step_type' or 'integration_type'")
         
         # Generate a unique step API ID
-        step_api_id = str(uuid.uuid4())
+        step_api_id = uuid.uuid4().hex
         
         # Generate API signature and documentation
         base_url = "http://localhost:8000"  # TODO: Get from config in production
@@ -529,40 +823,40 @@ async def deploy_step_api(
         headers = step_config.get("request_headers", {})
         request_schema = step_config.get("request_schema", {})
         
-        # Build curl command
-        curl_command = f"curl -X {http_method} '{full_endpoint_url}'"
-        if headers:
-            for key, value in headers.items():
-                curl_command += f" \\\n  -H '{key}: {value}'"
-        if request_schema and http_method in ["POST", "PUT", "PATCH"]:
+        # Build curl command from its lines in one join
+        curl_parts = [f"curl -X {http_method} '{full_endpoint_url}'"]
+        curl_parts.extend(f"  -H '{key}: {value}'" for key, value in (headers or {}).items())
+        if request_schema and http_method in _BODY_METHODS:
+            curl_parts.append("  -H 'Content-Type: application/json'")
             # Convert request schema to JSON example
-            import json
             try:
-                example_body = json.dumps(request_schema, indent=2)
-                curl_command += f" \\\n  -H 'Content-Type: application/json' \\\n  -d '{example_body}'"
-            except:
-                curl_command += f" \\\n  -H 'Content-Type: application/json' \\\n  -d '{{}}'"
-        
-        # Create step API record in database
-        deployed_api = DeployedAPI(
-            id=step_api_id,
-            lender_id=lender_id,
-            step_name=step_name,
-            step_config=step_config,
-            api_signature={
-                "method": http_method,
-                "endpoint": full_endpoint_url,
-                "curl_command": curl_command,
-                "headers": headers,
-                "request_schema": request_schema,
-                "example_request": request_schema if request_schema else {},
-                "response_format": "JSON",
-                "authentication": "None" if step_config.get("auth_type") == "NONE" else step_config.get("auth_type", "Unknown")
-            },
-            status="active"
-        )
-        
-        db.add(deployed_api)
+                curl_parts.append(f"  -d '{orjson.dumps(request_schema, option=orjson.OPT_INDENT_2).decode()}'")
+            except TypeError:
+                curl_parts.append("  -d '{}'")
+        curl_command = " \\\n".join(curl_parts)
+        
+        api_signature = {
+            "method": http_method,
+            "endpoint": full_endpoint_url,
+            "curl_command": curl_command,
+            "headers": headers,
+            "request_schema": request_schema,
+            "example_request": request_schema if request_schema else {},
+            "response_format": "JSON",
+            "authentication": "None" if step_config.get("auth_type") == "NONE" else step_config.get("auth_type", "Unknown")
+        }
+        
+        # Create step API record in database with a Core INSERT; the id is ours
+        await db.execute(
+            insert(DeployedAPI).values(
+                id=step_api_id,
+                lender_id=lender_id,
+                step_name=step_name,
+                step_config=step_config,
+                api_signature=api_signature,
+                status="active"
+            )
+        )
         await db.commit()
         
         # Create response data
@@ -574,12 +868,12 @@ async def deploy_step_api(
             "step_config": step_config,
             "sequence_id": sequence_id,
             "status": "deployed",
-            "deployed_at": str(datetime.datetime.utcnow()),
+            "deployed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
             "endpoint_url": f"/api/v1/steps/{step_api_id}",
             "full_endpoint_url": full_endpoint_url,
             "step_type": step_type,
             "description": step_config.get("description", ""),
-            "api_signature": deployed_api.api_signature
+            "api_signature": api_signature
         }
         
         logger.info(
@@ -596,6 +890,8 @@ async def deploy_step_api(
             data=step_api_info
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Failed to deploy step API",
@@ -609,45 +905,26 @@ async def deploy_step_api(
         )
 
 
-@router.get("/lender/{lender_id}/deployed-apis")
+@router.get("/lender/{lender_id}/deployed-apis", dependencies=[Depends(require_lender)])
 async def get_deployed_apis_for_lender(
     lender_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Get all deployed APIs for a specific lender"""
     try:
-        # Get the lender
+        # Core projection of the response columns, returned as plain dicts without
+        # ORM hydration; ix_deployed_apis_lender_status_deployed serves the filter and order
         result = await db.execute(
-            select(Lender).where(Lender.id == lender_id)
-        )
-        lender = result.scalar_one_or_none()
-        
-        if not lender:
-            raise HTTPException(status_code=404, detail="Lender not found")
-        
-        # Get deployed APIs from database
-        result = await db.execute(
-            select(DeployedAPI).where(
+            select(
+                DeployedAPI.id, DeployedAPI.step_name, DeployedAPI.step_config,
+                DeployedAPI.api_signature, DeployedAPI.status, DeployedAPI.deployed_at,
+                DeployedAPI.last_executed_at, DeployedAPI.execution_count, DeployedAPI.error_count
+            ).where(
                 DeployedAPI.lender_id == lender_id,
                 DeployedAPI.status == "active"
             ).order_by(DeployedAPI.deployed_at.desc())
         )
-        deployed_apis = result.scalars().all()
-        
-        # Convert to response format
-        api_list = []
-        for api in deployed_apis:
-            api_list.append({
-                "id": api.id,
-                "step_name": api.step_name,
-                "step_config": api.step_config,
-                "api_signature": api.api_signature,
-                "status": api.status,
-                "deployed_at": api.deployed_at.isoformat() if api.deployed_at else None,
-                "last_executed_at": api.last_executed_at.isoformat() if api.last_executed_at else None,
-                "execution_count": api.execution_count,
-                "error_count": api.error_count
-            })
+        api_list = [dict(row) for row in result.mappings()]
         
         return ResponseModel(
             success=True,
@@ -655,6 +932,8 @@ async def get_deployed_apis_for_lender(
             data=api_list
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Failed to get deployed APIs for lender",
@@ -667,22 +946,13 @@ async def get_deployed_apis_for_lender(
         )
 
 
-@router.get("/lender/{lender_id}/integration-deployment")
+@router.get("/lender/{lender_id}/integration-deployment", dependencies=[Depends(require_lender)])
 async def get_integration_deployment_for_lender(
     lender_id: int,
     db: AsyncSession = Depends(get_db)
 ):
     """Get integration deployment for a specific lender"""
     try:
-        # Get the lender
-        result = await db.execute(
-            select(Lender).where(Lender.id == lender_id)
-        )
-        lender = result.scalar_one_or_none()
-        
-        if not lender:
-            raise HTTPException(status_code=404, detail="Lender not found")
-        
         # Get integration deployment from database
         result = await db.execute(
             select(DeployedIntegration).where(
@@ -719,6 +989,8 @@ async def get_integration_deployment_for_lender(
             data=deployment_data
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             "Failed to get integration deployment for lender",
@@ -738,17 +1010,19 @@ async def delete_step_api(
 ):
     """Delete/undeploy a step API"""
     try:
-        # Get the deployed API
+        # Soft delete by setting status to inactive, in one UPDATE ... RETURNING
         result = await db.execute(
-            select(DeployedAPI).where(DeployedAPI.id == step_id)
+            update(DeployedAPI)
+            .where(DeployedAPI.id == step_id)
+            .values(status="inactive")
+            .returning(DeployedAPI.id, DeployedAPI.lender_id)
+            .execution_options(synchronize_session=False)
         )
-        deployed_api = result.scalar_one_or_none()
+        deployed_api = result.first()
         
         if not deployed_api:
             raise HTTPException(status_code=404, detail="Deployed API not found")
         
-        # Soft delete by setting status to inactive
-        deployed_api.status = "inactive"
         await db.commit()
         
         logger.info(
@@ -763,7 +1037,10 @@ async def delete_step_api(
             data={"id": step_id, "status": "deleted"}
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
+        await db.rollback()
         logger.error(
             "Failed to delete step API",
             step_id=step_id,
@@ -782,17 +1059,19 @@ async def delete_integration_deployment(
 ):
     """Delete/undeploy an integration deployment"""
     try:
-        # Get the deployed integration
+        # Soft delete by setting status to inactive, in one UPDATE ... RETURNING
         result = await db.execute(
-            select(DeployedIntegration).where(DeployedIntegration.id == integration_id)
+            update(DeployedIntegration)
+            .where(DeployedIntegration.id == integration_id)
+            .values(status="inactive")
+            .returning(DeployedIntegration.id, DeployedIntegration.lender_id)
+            .execution_options(synchronize_session=False)
         )
-        deployed_integration = result.scalar_one_or_none()
+        deployed_integration = result.first()
         
         if not deployed_integration:
             raise HTTPException(status_code=404, detail="Integration deployment not found")
         
-        # Soft delete by setting status to inactive
-        deployed_integration.status = "inactive"
         await db.commit()
         
         logger.info(
@@ -807,7 +1086,10 @@ async def delete_integration_deployment(
             data={"id": integration_id, "status": "deleted"}
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
+        await db.rollback()
         logger.error(
             "Failed to delete integration deployment",
             integration_id=integration_id,
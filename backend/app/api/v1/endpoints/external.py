@@ -6,32 +6,37 @@ from ...v1.endpoints.lenders import logger  # reuse structured logger
 from ....schemas.common import ResponseModel
 from ....services.integration_runner import IntegrationRunner
 from ....core.config import settings
+from ....core.cache import claim_key
 import hashlib
-import time
 from typing import Optional
 
 
 router = APIRouter()
 
 
-_IDEMPOTENCY_CACHE: dict[str, float] = {}
+# Redis namespace for seen Idempotency-Key values
+IDEMPOTENCY_KEY_PREFIX = "idem"
+
+# SHA-256 digests of the accepted API keys. Presented keys are hashed and
+# looked up here, so no comparison runs against the secret itself
+_HASHED_API_KEYS = frozenset(hashlib.sha256(key.encode()).digest() for key in settings.EXTERNAL_API_KEYS)
 
 
 def _check_api_key(x_api_key: Optional[str]) -> None:
     if not settings.EXTERNAL_API_KEYS:
         return
-    if not x_api_key or x_api_key not in settings.EXTERNAL_API_KEYS:
+    if not x_api_key or hashlib.sha256(x_api_key.encode()).digest() not in _HASHED_API_KEYS:
         raise HTTPException(status_code=401, detail="Invalid API key")
 
 
-def _check_idempotency(idempotency_key: Optional[str]) -> None:
+async def _check_idempotency(idempotency_key: Optional[str]) -> None:
     if not idempotency_key:
         return
-    now = time.time()
-    exp = _IDEMPOTENCY_CACHE.get(idempotency_key)
-    if exp and exp > now:
+    # Client keys are arbitrary strings; store a fixed 128-bit digest instead
+    digest = hashlib.blake2b(idempotency_key.encode(), digest_size=16).hexdigest()
+    # SET NX with a TTL: the first request claims the key in every worker, and Redis expires it
+    if not await claim_key(f"{IDEMPOTENCY_KEY_PREFIX}:{digest}", settings.IDEMPOTENCY_TTL_SECONDS):
         raise HTTPException(status_code=409, detail="Duplicate request")
-    _IDEMPOTENCY_CACHE[idempotency_key] = now + settings.IDEMPOTENCY_TTL_SECONDS
 
 
 @router.post("/lenders/{lender_id}/lead-submission", response_model=ResponseModel)
@@ -44,7 +49,7 @@ async def external_lead_submission(
 ):
     try:
         _check_api_key(x_api_key)
-        _check_idempotency(idempotency_key)
+        await _check_idempotency(idempotency_key)
         runner = IntegrationRunner()
         result = await runner.run(db, lender_id, payload or {}, mode="live")
         return ResponseModel(message="Lead submission executed", data=result)
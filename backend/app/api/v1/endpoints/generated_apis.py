@@ -1,19 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_, case, type_coerce, JSON
+from sqlalchemy.orm import selectinload
 from typing import Optional, Dict, Any
+import asyncio
+import os
 import structlog
 
-from ....core.database import get_db
+from ....core.database import get_db, fetch_scalar, fetch_mappings
+from ....core.pagination import encode_cursor, decode_cursor
+from ....core.cache import GENERATED_APIS_COUNT_PREFIX, cached_count, invalidate_namespace
 from ....models.generated_api import GeneratedAPI
 from ....models.lender import Lender
 from ....services.api_generator import APIGenerator
+from ....services.generated_api_cache import invalidate_generated_api
 from ....schemas.common import ResponseModel, PaginationParams, PaginationInfo
 
 logger = structlog.get_logger()
 router = APIRouter()
 
 
+def _unlink_if_exists(file_path: str) -> None:
+    """Remove a file, ignoring one that is already gone"""
+    try:
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
 @router.post("/generate", response_model=ResponseModel, status_code=status.HTTP_202_ACCEPTED)
 async def generate_api_client(
     background_tasks: BackgroundTasks,
@@ -85,7 +100,7 @@ async def _generate_api_client_task(
     config: Optional[Dict[str, Any]]
 ):
     """Background task for API generation"""
-    from ...core.database import AsyncSessionLocal
+    from ....core.database import AsyncSessionLocal
     
     async with AsyncSessionLocal() as db:
         try:
@@ -105,6 +120,7 @@ async def _generate_api_client_task(
             generated_api.test_status = "passed" if is_valid else "failed"
             
             await db.commit()
+            await invalidate_namespace(GENERATED_APIS_COUNT_PREFIX)
             
             logger.info(
                 "API generation completed",
@@ -128,38 +144,64 @@ async def get_generated_apis(
     framework: Optional[str] = Query(None, description="Filter by framework"),
     is_valid: Optional[bool] = Query(None, description="Filter by validation status"),
     test_status: Optional[str] = Query(None, description="Filter by test status"),
-    db: AsyncSession = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Resume after the row encoded by a previous next_cursor")
 ):
     """Get paginated list of generated APIs with optional filtering"""
     try:
-        # Build query
-        query = select(GeneratedAPI).options(
-            selectinload(GeneratedAPI.lender)
-        )
+        if cursor and pagination.sort_by:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="cursor can only be used with the default ordering"
+            )
+        
+        conditions = []
         
         # Apply filters
         if lender_id:
-            query = query.where(GeneratedAPI.lender_id == lender_id)
+            conditions.append(GeneratedAPI.lender_id == lender_id)
         
         if language:
-            query = query.where(GeneratedAPI.language == language)
+            conditions.append(GeneratedAPI.language == language)
         
         if framework:
-            query = query.where(GeneratedAPI.framework == framework)
+            conditions.append(GeneratedAPI.framework == framework)
         
         if is_valid is not None:
-            query = query.where(GeneratedAPI.is_valid == is_valid)
+            conditions.append(GeneratedAPI.is_valid == is_valid)
         
         if test_status:
-            query = query.where(GeneratedAPI.test_status == test_status)
-        
-        # Get total count
-        count_query = select(func.count()).select_from(query.subquery())
-        total = await db.scalar(count_query)
-        
-        # Apply pagination
-        offset = (pagination.page - 1) * pagination.size
-        query = query.offset(offset).limit(pagination.size)
+            conditions.append(GeneratedAPI.test_status == test_status)
+        
+        # Core projection of the listed columns; Postgres builds the nested lender object
+        query = select(
+            GeneratedAPI.id, GeneratedAPI.name, GeneratedAPI.description, GeneratedAPI.version,
+            GeneratedAPI.language, GeneratedAPI.framework, GeneratedAPI.file_path, GeneratedAPI.file_size,
+            GeneratedAPI.is_valid, GeneratedAPI.test_status, GeneratedAPI.generation_time,
+            GeneratedAPI.created_at,
+            type_coerce(
+                case(
+                    (Lender.id.isnot(None), func.json_build_object("id", Lender.id, "name", Lender.name)),
+                    else_=None
+                ),
+                JSON
+            ).label("lender")
+        ).outerjoin(Lender, Lender.id == GeneratedAPI.lender_id).where(*conditions)
+        
+        # Get total count straight off the table, no derived subquery
+        count_query = select(func.count(GeneratedAPI.id)).where(*conditions)
+        
+        # Apply pagination, seeking past the cursor row instead of scanning an offset.
+        # One extra row tells whether another page follows
+        if cursor:
+            try:
+                last_created_at, last_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+            query = query.where(tuple_(GeneratedAPI.created_at, GeneratedAPI.id) < (last_created_at, last_id))
+        else:
+            offset = (pagination.page - 1) * pagination.size
+            query = query.offset(offset)
+        query = query.limit(pagination.size + 1)
         
         # Apply sorting
         if pagination.sort_by:
@@ -168,54 +210,50 @@ async def get_generated_apis(
                 sort_column = sort_column.desc()
             query = query.order_by(sort_column)
         else:
-            query = query.order_by(GeneratedAPI.created_at.desc())
+            query = query.order_by(GeneratedAPI.created_at.desc(), GeneratedAPI.id.desc())
+        
+        # Paging through one filter set reuses the cached total
+        count_key = (lender_id, language, framework, is_valid, test_status)
+        
+        # Count and page run concurrently on separate sessions
+        total, generated_apis = await asyncio.gather(
+            cached_count(GENERATED_APIS_COUNT_PREFIX, count_key, lambda: fetch_scalar(count_query)),
+            fetch_mappings(query)
+        )
         
-        # Execute query
-        result = await db.execute(query)
-        generated_apis = result.scalars().all()
+        has_more = len(generated_apis) > pagination.size
+        generated_apis = generated_apis[:pagination.size]
         
         # Calculate pagination info
         pages = (total + pagination.size - 1) // pagination.size
         
+        # In the default ordering the next page can be fetched by keyset
+        next_cursor = None
+        if not pagination.sort_by and has_more:
+            next_cursor = encode_cursor(generated_apis[-1]["created_at"], generated_apis[-1]["id"])
+        
         return ResponseModel(
             message="Generated APIs retrieved successfully",
             data={
-                "generated_apis": [
-                    {
-                        "id": api.id,
-                        "name": api.name,
-                        "description": api.description,
-                        "version": api.version,
-                        "language": api.language,
-                        "framework": api.framework,
-                        "file_path": api.file_path,
-                        "file_size": api.file_size,
-                        "is_valid": api.is_valid,
-                        "test_status": api.test_status,
-                        "generation_time": api.generation_time,
-                        "created_at": api.created_at,
-                        "lender": {
-                            "id": api.lender.id,
-                            "name": api.lender.name
-                        } if api.lender else None
-                    }
-                    for api in generated_apis
-                ],
+                "generated_apis": generated_apis,
                 "total": total,
                 "page": pagination.page,
                 "size": pagination.size,
-                "pages": pages
+                "pages": pages,
+                "next_cursor": next_cursor
             },
             pagination=PaginationInfo(
                 page=pagination.page,
                 size=pagination.size,
                 total=total,
                 pages=pages,
-                has_next=pagination.page < pages,
-                has_prev=pagination.page > 1
+                has_next=has_more,
+                has_prev=bool(cursor) or pagination.page > 1
             )
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error("Failed to retrieve generated APIs", error=str(e))
         raise HTTPException(
@@ -305,23 +343,21 @@ async def download_generated_api(
                 detail=f"Generated API with ID {generated_api_id} not found"
             )
         
-        # Read file content
+        # One stat off the event loop doubles as the existence check; Starlette
+        # reuses it and sends the file in chunks rather than reading it into memory
         try:
-            with open(generated_api.file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            stat_result = await asyncio.to_thread(os.stat, generated_api.file_path)
         except FileNotFoundError:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Generated file not found"
             )
         
-        from fastapi.responses import Response
-        return Response(
-            content=content,
+        return FileResponse(
+            generated_api.file_path,
+            stat_result=stat_result,
             media_type="text/plain",
-            headers={
-                "Content-Disposition": f"attachment; filename={generated_api.name.replace(' ', '_')}.{generated_api.language}"
-            }
+            filename=f"{generated_api.name.replace(' ', '_')}.{generated_api.language}"
         )
         
     except HTTPException:
@@ -360,6 +396,7 @@ async def validate_generated_api(
         generated_api.is_valid = is_valid
         generated_api.test_status = "passed" if is_valid else "failed"
         await db.commit()
+        await invalidate_namespace(GENERATED_APIS_COUNT_PREFIX)
         
         return ResponseModel(
             message="Generated API validation completed",
@@ -399,17 +436,17 @@ async def delete_generated_api(
                 detail=f"Generated API with ID {generated_api_id} not found"
             )
         
-        # Delete file if it exists
+        # Delete file if it exists, off the event loop
         try:
-            import os
-            if os.path.exists(generated_api.file_path):
-                os.remove(generated_api.file_path)
+            await asyncio.to_thread(_unlink_if_exists, generated_api.file_path)
         except Exception as e:
             logger.warning("Failed to delete generated file", file_path=generated_api.file_path, error=str(e))
         
         # Delete database record
         await db.delete(generated_api)
         await db.commit()
+        invalidate_generated_api(generated_api_id)
+        await invalidate_namespace(GENERATED_APIS_COUNT_PREFIX)
         
         logger.info("Generated API deleted successfully", generated_api_id=generated_api_id)
         
@@ -1,27 +1,44 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+import asyncio
 import time
 import psutil
-import redis.asyncio as redis
 from typing import Dict, Any
 
 from ....core.database import get_db
 from ....core.config import settings
+from ....core.cache import get_redis
 from ....schemas.common import HealthCheck
 
 router = APIRouter()
 
-# Redis client
-redis_client = None
+# Seconds a system metrics sample is reused across health probes
+SYSTEM_METRICS_TTL = 5
 
+# Last (monotonic time, metrics) sample
+_system_metrics_cache: Dict[str, Any] = {"ts": 0.0, "data": None}
 
-async def get_redis_client():
-    """Get Redis client"""
-    global redis_client
-    if redis_client is None:
-        redis_client = redis.from_url(settings.REDIS_URL)
-    return redis_client
+# cpu_percent(interval=None) reports usage since the previous call; prime it
+psutil.cpu_percent(interval=None)
+
+
+def _sample_system_metrics() -> Dict[str, Any]:
+    """Read CPU, memory and disk usage without sleeping for a CPU interval"""
+    return {
+        "cpu_percent": psutil.cpu_percent(interval=None),
+        "memory_percent": psutil.virtual_memory().percent,
+        "disk_percent": psutil.disk_usage('/').percent
+    }
+
+
+async def get_system_metrics() -> Dict[str, Any]:
+    """System metrics, sampled on a worker thread at most once per SYSTEM_METRICS_TTL"""
+    now = time.monotonic()
+    if _system_metrics_cache["data"] is None or now - _system_metrics_cache["ts"] >= SYSTEM_METRICS_TTL:
+        _system_metrics_cache["data"] = await asyncio.to_thread(_sample_system_metrics)
+        _system_metrics_cache["ts"] = now
+    return _system_metrics_cache["data"]
 
 
 @router.get("/", response_model=HealthCheck)
@@ -40,7 +57,7 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     # Check Redis
     redis_status = "unknown"
     try:
-        redis_client = await get_redis_client()
+        redis_client = get_redis()
         await redis_client.ping()
         redis_status = "healthy"
     except Exception as e:
@@ -80,7 +97,7 @@ async def detailed_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str,
     
     # Redis check
     try:
-        redis_client = await get_redis_client()
+        redis_client = get_redis()
         start_time = time.time()
         await redis_client.ping()
         response_time = time.time() - start_time
@@ -90,10 +107,6 @@ async def detailed_health_check(db: AsyncSession = Depends(get_db)) -> Dict[str,
         health_data["status"] = "degraded"
     
     # System metrics
-    health_data["system"] = {
-        "cpu_percent": psutil.cpu_percent(interval=1),
-        "memory_percent": psutil.virtual_memory().percent,
-        "disk_percent": psutil.disk_usage('/').percent
-    }
+    health_data["system"] = await get_system_metrics()
     
     return health_data
@@ -1,18 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, func, delete, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 import structlog
 
 from ....core.database import get_db
 from ....models.lender import Lender
+from ....models.api_config import APIConfig
 from ....schemas.lender import LenderCreate, LenderUpdate, LenderResponse, LenderList
 from ....schemas.common import ResponseModel, PaginationParams, PaginationInfo
 from ....models.field_mapping import FieldMapping, TransformationType, DataType
 from ....models.integration import IntegrationSequence, Integration, IntegrationType, AuthenticationType, IntegrationLog, IntegrationStatus
 from ....models.deployed_api import DeployedIntegration
 from ....services.integration_runner import IntegrationRunner
+from ....core.cache import ANALYTICS_CACHE_PREFIX, invalidate_namespace
 from .auth import get_current_user
 from sqlalchemy import update
 
@@ -27,16 +30,6 @@ async def create_lender(
 ):
     """Create a new lender"""
     try:
-        # Check if lender with same name already exists
-        existing_lender = await db.execute(
-            select(Lender).where(Lender.name == lender_data.name)
-        )
-        if existing_lender.scalar_one_or_none():
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=f"Lender with name '{lender_data.name}' already exists"
-            )
-        
         # Create new lender - convert HttpUrl fields to strings
         lender_dict = lender_data.model_dump()
         
@@ -50,10 +43,22 @@ async def create_lender(
         if lender_dict.get('support_url'):
             lender_dict['support_url'] = str(lender_dict['support_url'])
         
-        lender = Lender(**lender_dict)
-        db.add(lender)
+        # The unique index on name rejects duplicates within the INSERT itself
+        lender = await db.scalar(
+            pg_insert(Lender)
+            .values(**lender_dict)
+            .on_conflict_do_nothing(index_elements=[Lender.name])
+            .returning(Lender)
+        )
+        
+        if lender is None:
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Lender with name '{lender_data.name}' already exists"
+            )
+        
         await db.commit()
-        await db.refresh(lender)
         
         logger.info("Lender created successfully", lender_id=lender.id, lender_name=lender.name)
         
@@ -215,10 +220,12 @@ async def update_lender(
                     detail=f"Lender with name '{lender_data.name}' already exists"
                 )
         
-        # Update lender fields
+        # Update lender fields; assigning an equal value would still mark JSON
+        # columns like auth_config dirty and re-serialize them on flush
         update_data = lender_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
-            setattr(lender, field, value)
+            if getattr(lender, field) != value:
+                setattr(lender, field, value)
         
         await db.commit()
         await db.refresh(lender)
@@ -248,20 +255,25 @@ async def delete_lender(
 ):
     """Delete a lender"""
     try:
-        # Get existing lender
+        # Get existing lender and whether any API configuration references it in
+        # one round-trip; EXISTS stops at the first match instead of loading them all
         result = await db.execute(
-            select(Lender).where(Lender.id == lender_id)
+            select(
+                Lender,
+                exists().where(APIConfig.lender_id == Lender.id).label("has_api_configs")
+            ).where(Lender.id == lender_id)
         )
-        lender = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not lender:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Lender with ID {lender_id} not found"
             )
+        lender = row.Lender
         
         # Check if lender has associated configurations
-        if lender.api_configs:
+        if row.has_api_configs:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Cannot delete lender with associated API configurations"
@@ -471,6 +483,7 @@ async def save_field_mappings(
             )
             db.add(fm)
         await db.commit()
+        await invalidate_namespace(ANALYTICS_CACHE_PREFIX)
         return ResponseModel(message="Field mappings saved successfully")
     except Exception as e:
         await db.rollback()
@@ -2,11 +2,13 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from typing import Optional
+import asyncio
 import structlog
 
 from ....core.database import get_db
 from ....models.user import User
 from ....schemas.common import ResponseModel, PaginationParams, PaginationInfo
+from .auth import pwd_context
 
 logger = structlog.get_logger()
 router = APIRouter()
@@ -43,11 +45,9 @@ async def create_user(
                     detail=f"User with username '{username}' already exists"
                 )
         
-        # Hash password if provided
+        # Hash password if provided, off the event loop (bcrypt is CPU-bound)
         if "password" in user_data:
-            from passlib.context import CryptContext
-            pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-            user_data["hashed_password"] = pwd_context.hash(user_data.pop("password"))
+            user_data["hashed_password"] = await asyncio.to_thread(pwd_context.hash, user_data.pop("password"))
         
         # Create user
         user = User(**user_data)
@@ -258,15 +258,14 @@ async def update_user(
                     detail=f"User with username '{user_data['username']}' already exists"
                 )
         
-        # Hash password if provided
+        # Hash password if provided, off the event loop (bcrypt is CPU-bound)
         if "password" in user_data:
-            from passlib.context import CryptContext
-            pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-            user_data["hashed_password"] = pwd_context.hash(user_data.pop("password"))
+            user_data["hashed_password"] = await asyncio.to_thread(pwd_context.hash, user_data.pop("password"))
         
-        # Update fields
+        # Update fields; skip unchanged values so JSON columns (permissions,
+        # preferences) are not marked dirty and re-serialized on flush
         for field, value in user_data.items():
-            if hasattr(user, field):
+            if hasattr(user, field) and getattr(user, field) != value:
                 setattr(user, field, value)
         
         await db.commit()
@@ -0,0 +1,170 @@
+import functools
+import inspect
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+import orjson
+import redis.asyncio as redis
+import structlog
+
+from .config import settings
+
+logger = structlog.get_logger()
+
+# Namespaces shared between the routers and services that read and invalidate them
+ANALYTICS_CACHE_PREFIX = "analytics"
+API_TESTS_COUNT_PREFIX = "count:api_tests"
+API_TEMPLATES_COUNT_PREFIX = "count:api_templates"
+GENERATED_APIS_COUNT_PREFIX = "count:generated_apis"
+
+# Redis client shared by the response caches
+redis_client: Optional[redis.Redis] = None
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared Redis client, backed by one bounded connection pool"""
+    global redis_client
+    if redis_client is None:
+        redis_client = redis.Redis(
+            connection_pool=redis.ConnectionPool.from_url(
+                settings.REDIS_URL,
+                max_connections=settings.REDIS_MAX_CONNECTIONS
+            )
+        )
+    return redis_client
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client and its pool"""
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose(close_connection_pool=True)
+        redis_client = None
+
+
+def json_default(value: Any) -> Any:
+    """Serialize values orjson does not handle natively (e.g. SQL AVG results)"""
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+async def cache_get(key: str) -> Optional[Any]:
+    """Return the cached value for a key, or None on miss or Redis failure"""
+    try:
+        raw = await get_redis().get(key)
+    except Exception as e:
+        logger.warning("Cache read failed", key=key, error=str(e))
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_set(key: str, value: Any, ttl: int) -> None:
+    """Store a JSON-serializable value under a key for ttl seconds"""
+    try:
+        await get_redis().set(key, orjson.dumps(value, default=json_default), ex=ttl)
+    except Exception as e:
+        logger.warning("Cache write failed", key=key, error=str(e))
+
+
+async def claim_key(key: str, ttl: int) -> bool:
+    """Set key for ttl seconds unless it exists, returning whether it was set.
+
+    Shared across workers; fails open (returns True) if Redis is unavailable.
+    """
+    try:
+        return bool(await get_redis().set(key, b"1", ex=ttl, nx=True))
+    except Exception as e:
+        logger.warning("Cache claim failed", key=key, error=str(e))
+        return True
+
+
+async def cache_delete(key: str) -> None:
+    """Drop a single cached key"""
+    try:
+        await get_redis().delete(key)
+    except Exception as e:
+        logger.warning("Cache delete failed", key=key, error=str(e))
+
+
+async def namespace_key(namespace: str, *parts: Any) -> str:
+    """Cache key for parts under the namespace's current version.
+
+    Keys look like ``{namespace}:v{version}:{part}:{part}...``; bumping the
+    version with invalidate_namespace() retires all of them at once.
+    """
+    try:
+        version = await get_redis().get(f"{namespace}:version")
+    except Exception as e:
+        logger.warning("Cache version read failed", namespace=namespace, error=str(e))
+        version = None
+    return ":".join([namespace, f"v{int(version or 0)}", *(str(part) for part in parts)])
+
+
+async def invalidate_namespace(namespace: str) -> None:
+    """Retire every key under namespace with one INCR; the old keys expire by TTL"""
+    try:
+        await get_redis().incr(f"{namespace}:version")
+    except Exception as e:
+        logger.warning("Cache invalidation failed", namespace=namespace, error=str(e))
+
+
+async def cached_count(
+    namespace: str,
+    key_parts: Sequence[Any],
+    count: Callable[[], Awaitable[int]],
+    ttl: int = 30
+) -> int:
+    """Return the cached total for a listing filter set, running count() on a miss"""
+    key = await namespace_key(namespace, *key_parts)
+    hit = await cache_get(key)
+    if hit is not None:
+        return hit
+    total = await count()
+    await cache_set(key, total, ttl)
+    return total
+
+
+class Uncached:
+    """Wraps a value a cached() method returns without it being stored.
+
+    Methods that fall back to an empty result on a failed query return
+    Uncached(fallback), so one transient error is not served from the cache.
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+def cached(namespace: str, ttl: int):
+    """Cache the result of an async service method taking (self, db, ...) in Redis.
+
+    The key is ``{namespace}:v{version}:{method}:{arg}:{arg}...`` built from the
+    arguments after the session, with defaults applied so equivalent calls
+    share an entry; invalidate_namespace(namespace) retires every entry.
+    An Uncached result is unwrapped and returned without being stored.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(self, db, *args, **kwargs):
+            bound = signature.bind(self, db, *args, **kwargs)
+            bound.apply_defaults()
+            key_args = list(bound.arguments.values())[2:]
+            key = await namespace_key(namespace, func.__name__, *key_args)
+
+            hit = await cache_get(key)
+            if hit is not None:
+                return hit
+
+            result = await func(self, db, *args, **kwargs)
+            if isinstance(result, Uncached):
+                return result.value
+            await cache_set(key, result, ttl)
+            return result
+
+        return wrapper
+
+    return decorator
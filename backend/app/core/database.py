@@ -1,16 +1,29 @@
+import asyncio
+import orjson
+from contextlib import AsyncExitStack
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.pool import StaticPool
 from .config import settings
+from .cache import json_default
+
+
+def _json_serializer(value) -> str:
+    """Encode JSON column values with orjson instead of the stdlib json module"""
+    return orjson.dumps(value, default=json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    pool_size=10,
-    max_overflow=20,
+    pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+    pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
+    json_serializer=_json_serializer,
+    json_deserializer=orjson.loads,
 )
 
 # Create async session factory
@@ -35,12 +48,49 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def fetch_scalar(statement):
+    """Run a scalar query on its own short-lived session.
+    
+    Lets independent queries of one request overlap via asyncio.gather,
+    which a single AsyncSession does not allow.
+    """
+    async with AsyncSessionLocal() as session:
+        return await session.scalar(statement)
+
+
+async def fetch_scalars(statement) -> list:
+    """Run a query on its own short-lived session and return the scalar rows"""
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(statement)).scalars().all()
+
+
+async def fetch_mappings(statement) -> list:
+    """Run a Core query on its own short-lived session and return rows as dicts"""
+    async with AsyncSessionLocal() as session:
+        return [dict(row) for row in (await session.execute(statement)).mappings()]
+
+
 async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
+        # Trigram indexes (lender search) need the extension before their tables
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def warmup_pool(size: int = settings.DATABASE_POOL_SIZE):
+    """Open pool connections concurrently so early requests skip the handshake"""
+    async def open_connection(stack: AsyncExitStack):
+        connection = await stack.enter_async_context(engine.connect())
+        await connection.execute(text("SELECT 1"))
+    
+    # Hold every connection until all are open, then return them to the pool
+    async with AsyncExitStack() as stack:
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(size):
+                tg.create_task(open_connection(stack))
+
+
 async def close_db():
     """Close database connections"""
     await engine.dispose()
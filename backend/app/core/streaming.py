@@ -0,0 +1,210 @@
+import asyncio
+import contextlib
+import io
+import os
+import shutil
+import zipfile
+from datetime import datetime, timezone
+import uuid
+from typing import Any, AsyncIterator, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import orjson
+
+from .cache import json_default
+from .config import settings
+from ..schemas.common import PaginationInfo
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a value with orjson, as the response and cache layers do"""
+    return orjson.dumps(value, default=json_default)
+
+
+def open_list_envelope(message: str, list_key: str) -> bytes:
+    """Opening bytes of a ResponseModel whose data begins with a streamed list.
+
+    Follow with the encoded list items separated by b"," and finish with
+    close_list_envelope().
+    """
+    return b'{"success":true,"message":' + dumps(message) + b',"data":{' + dumps(list_key) + b':['
+
+
+def close_list_envelope(
+    data_fields: Dict[str, Any],
+    pagination: Optional[PaginationInfo] = None
+) -> bytes:
+    """Closing bytes: the remaining data fields, then the rest of the ResponseModel"""
+    chunk = b"]"
+    for key, value in data_fields.items():
+        chunk += b"," + dumps(key) + b":" + dumps(value)
+    return chunk + b"}" + close_envelope(pagination)
+
+
+def close_envelope(pagination: Optional[PaginationInfo] = None) -> bytes:
+    """Bytes after a ResponseModel's data: errors, pagination and a fresh timestamp"""
+    return (
+        b',"errors":null,"pagination":' + dumps(pagination.model_dump() if pagination else None)
+        + b',"timestamp":' + dumps(datetime.now(timezone.utc)) + b"}"
+    )
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """Unseekable sink that holds ZipFile output until the stream drains it"""
+
+    def __init__(self):
+        self._data = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._data.extend(b)
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = bytes(self._data)
+        self._data.clear()
+        return data
+
+
+# Formats that are compressed already (images, fonts, archives, packages);
+# deflating them again burns CPU for no gain, so they are stored as-is.
+# Everything else the generator writes is text and is deflated
+_STORED_SUFFIXES = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".ico", ".woff", ".woff2",
+    ".gz", ".tgz", ".bz2", ".xz", ".zst", ".zip", ".jar", ".war", ".whl", ".egg"
+})
+
+
+def _compress_type(file_path: str) -> int:
+    """ZIP_STORED for already-compressed formats, ZIP_DEFLATED for everything else"""
+    if os.path.splitext(file_path)[1].lower() in _STORED_SUFFIXES:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+# Read size when copying a file into an archive entry; zipfile's own copy
+# loop reads 8 KiB at a time
+_COPY_BUFFER_SIZE = 1 << 20
+
+
+def _write_entry(zipf: zipfile.ZipFile, file_path: str, arcname: str) -> None:
+    """Copy one file into zipf in large unbuffered reads"""
+    info = zipfile.ZipInfo.from_file(file_path, arcname)
+    info.compress_type = _compress_type(file_path)
+    with open(file_path, "rb", buffering=0) as src, zipf.open(info, "w", force_zip64=True) as dst:
+        shutil.copyfileobj(src, dst, _COPY_BUFFER_SIZE)
+
+
+def _open_entry(zipf: zipfile.ZipFile, file_path: str, arcname: str) -> Tuple[BinaryIO, BinaryIO]:
+    """Open file_path for unbuffered reads and a matching entry in zipf for writing"""
+    info = zipfile.ZipInfo.from_file(file_path, arcname)
+    info.compress_type = _compress_type(file_path)
+    src = open(file_path, "rb", buffering=0)
+    try:
+        return src, zipf.open(info, "w", force_zip64=True)
+    except BaseException:
+        src.close()
+        raise
+
+
+def _copy_block(src: BinaryIO, dst: BinaryIO) -> bool:
+    """Copy up to one buffer from src to dst, returning whether more may follow"""
+    block = src.read(_COPY_BUFFER_SIZE)
+    dst.write(block)
+    return len(block) == _COPY_BUFFER_SIZE
+
+
+def _scan(root: str) -> Iterator[os.DirEntry]:
+    """Yield every entry under root with one scandir per directory, without following dir symlinks"""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                yield entry
+
+
+def _iter_files(root: str) -> Iterator[Tuple[str, str]]:
+    """Yield (path, archive name) for every file under root"""
+    # Entry paths all start with root + separator, so the archive name is a slice
+    prefix_len = len(os.path.join(root, ""))
+    for entry in _scan(root):
+        if entry.is_file():
+            yield entry.path, entry.path[prefix_len:]
+
+
+def tree_mtime(root: str) -> float:
+    """Latest mtime of root, its subdirectories and files.
+
+    Directory mtimes change when entries are added, removed or renamed, so
+    this moves whenever the archive contents would.
+    """
+    latest = os.stat(root).st_mtime
+    for entry in _scan(root):
+        latest = max(latest, entry.stat(follow_symlinks=False).st_mtime)
+    return latest
+
+
+def tree_size(root: str, files: Optional[Iterable[Tuple[str, str]]] = None) -> int:
+    """Total uncompressed bytes of the files that would be packed from root"""
+    if files is not None:
+        return sum(os.path.getsize(file_path) for file_path, _ in files)
+    # Walking, take sizes off the DirEntry instead of stat()ing each path again
+    return sum(entry.stat().st_size for entry in _scan(root) if entry.is_file())
+
+
+def write_zip(root: str, zip_path: str, files: Optional[Iterable[Tuple[str, str]]] = None) -> None:
+    """Write a ZIP of root to zip_path, replacing it atomically.
+
+    files, if given, is the (path, archive name) manifest to pack instead of
+    walking root. Blocking; run it on a worker thread from async code.
+    """
+    tmp_path = f"{zip_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, compresslevel=settings.DEPLOYMENT_ZIP_COMPRESSLEVEL) as zipf:
+            for file_path, arcname in (_iter_files(root) if files is None else files):
+                _write_entry(zipf, file_path, arcname)
+        os.replace(tmp_path, zip_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+async def zip_directory(
+    root: str,
+    files: Optional[List[Tuple[str, str]]] = None,
+    limiter: Optional[asyncio.Semaphore] = None
+) -> AsyncIterator[bytes]:
+    """Yield a ZIP of every file under root as it is compressed.
+
+    The walk and the compression run on worker threads, one read buffer at a
+    time, and compressed bytes are yielded after every block, so large files
+    start flowing at once and memory stays at about one buffer. files, if
+    given, is a (path, archive name) manifest used instead of walking root.
+    limiter, if given, is held around each worker-thread step only, never
+    while a chunk waits on a slow client.
+    """
+    def step():
+        return limiter if limiter is not None else contextlib.nullcontext()
+    
+    # Walk the tree on a worker thread too; only chunk hand-off runs on the loop
+    if files is None:
+        async with step():
+            files = await asyncio.to_thread(list, _iter_files(root))
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=settings.DEPLOYMENT_ZIP_COMPRESSLEVEL) as zipf:
+        for file_path, arcname in files:
+            async with step():
+                src, dst = await asyncio.to_thread(_open_entry, zipf, file_path, arcname)
+            with src, dst:
+                more = True
+                while more:
+                    async with step():
+                        more = await asyncio.to_thread(_copy_block, src, dst)
+                    chunk = buffer.drain()
+                    if chunk:
+                        yield chunk
+    # Closing the archive writes the central directory
+    yield buffer.drain()
@@ -1,14 +1,18 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import logging
 import time
 import structlog
 from typing import Dict, Any
 
 from .core.config import settings
-from .core.database import init_db, close_db
+from .core.database import init_db, close_db, warmup_pool
+from .core.cache import get_redis, close_redis
+from .services.login_recorder import login_recorder
 from .api.v1.api import api_router
 from .api.v1.endpoints import health
 
@@ -27,7 +31,10 @@ structlog.configure(
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    # Calls below LOG_LEVEL are no-ops before any processor runs
+    wrapper_class=structlog.make_filtering_bound_logger(
+        logging.getLevelName(settings.LOG_LEVEL.upper())
+    ),
     cache_logger_on_first_use=True,
 )
 
@@ -41,13 +48,25 @@ async def lifespan(app: FastAPI):
     logger.info("Starting Lender API Integration Framework")
     await init_db()
     logger.info("Database initialized successfully")
+    await warmup_pool()
+    logger.info("Database connection pool warmed up", pool_size=settings.DATABASE_POOL_SIZE)
+    
+    # Create the shared Redis client before the first request needs it
+    get_redis()
+    
+    # Build the OpenAPI schema once; /openapi.json then serves the cached dict
+    app.openapi_schema = app.openapi()
+    
+    login_recorder.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Lender API Integration Framework")
+    await login_recorder.stop()
     await close_db()
     logger.info("Database connections closed")
+    await close_redis()
 
 
 # Create FastAPI application
@@ -76,6 +95,13 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure appropriately for production
 )
 
+# Compress JSON responses over 1 KiB; ZIP downloads are excluded by content type
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5
+)
+
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -1,11 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
 
 class APIConfig(Base):
     __tablename__ = "api_configs"
+    __table_args__ = (
+        # Matches the filter + default sort of the API config listing
+        Index(
+            "ix_api_configs_lender_method_active_created",
+            "lender_id", "method", "is_active", text("created_at DESC")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     lender_id = Column(Integer, ForeignKey("lenders.id"), nullable=False)
@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, Index
+from sqlalchemy.sql import func, text
+from sqlalchemy.orm import deferred
 from ..core.database import Base
 
 
 class APITemplate(Base):
     __tablename__ = "api_templates"
+    __table_args__ = (
+        # Keyset pagination of the template listing seeks on (created_at, id)
+        Index("ix_api_templates_created_id", text("created_at DESC"), text("id DESC")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -15,7 +20,8 @@ class APITemplate(Base):
     
     # Template content
     template_type = Column(String(50), nullable=False)  # "jinja2", "jinja2_python", "jinja2_typescript"
-    template_content = Column(Text, nullable=False)  # The actual template content
+    # Deferred so listings and existence checks skip the template body; undefer where it is rendered
+    template_content = deferred(Column(Text, nullable=False))  # The actual template content
     
     # Template metadata
     variables = Column(JSON, nullable=True)  # Required variables for the template
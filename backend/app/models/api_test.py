@@ -1,6 +1,6 @@
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, deferred
 from ..core.database import Base
 
 
@@ -15,10 +15,10 @@ class APITest(Base):
     description = Column(Text, nullable=True)
     test_type = Column(String(50), nullable=False)  # unit, integration, e2e, performance
     
-    # Test parameters
-    test_data = Column(JSON, nullable=True)  # Input data for the test
-    expected_response = Column(JSON, nullable=True)  # Expected response structure
-    validation_rules = Column(JSON, nullable=True)  # Custom validation rules
+    # Test parameters, deferred as one "payload" group; undefer_group("payload") to load them
+    test_data = deferred(Column(JSON, nullable=True), group="payload")  # Input data for the test
+    expected_response = deferred(Column(JSON, nullable=True), group="payload")  # Expected response structure
+    validation_rules = deferred(Column(JSON, nullable=True), group="payload")  # Custom validation rules
     
     # Test execution
     is_active = Column(Boolean, default=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..core.database import Base
@@ -6,6 +6,10 @@ from ..core.database import Base
 
 class DeployedAPI(Base):
     __tablename__ = "deployed_apis"
+    __table_args__ = (
+        # A lender's active step APIs, newest first
+        Index("ix_deployed_apis_lender_status_deployed", "lender_id", "status", text("deployed_at DESC")),
+    )
     
     id = Column(String, primary_key=True)  # UUID from deployment
     lender_id = Column(Integer, ForeignKey("lenders.id"), nullable=False)
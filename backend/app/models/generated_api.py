@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON, ForeignKey, Index
+from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
 
 class GeneratedAPI(Base):
     __tablename__ = "generated_apis"
+    __table_args__ = (
+        # Keyset pagination of the generated API listing seeks on (created_at, id)
+        Index("ix_generated_apis_created_id", text("created_at DESC"), text("id DESC")),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     lender_id = Column(Integer, ForeignKey("lenders.id"), nullable=False)
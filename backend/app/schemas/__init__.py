@@ -1,17 +1,17 @@
 from .lender import LenderCreate, LenderUpdate, LenderResponse, LenderList
-# from .api_config import APIConfigCreate, APIConfigUpdate, APIConfigResponse, APIConfigList
-# from .api_template import APITemplateCreate, APITemplateUpdate, APITemplateResponse, APITemplateList
+from .api_config import APIConfigCreate, APIConfigUpdate
+from .api_template import APITemplateCreate, APITemplateUpdate
 # from .generated_api import GeneratedAPICreate, GeneratedAPIUpdate, GeneratedAPIResponse, GeneratedAPIList
-# from .api_test import APITestCreate, APITestUpdate, APITestResponse, APITestList
+from .api_test import APITestCreate, APITestUpdate
 # from .user import UserCreate, UserUpdate, UserResponse, UserList
 from .common import PaginationParams, ResponseModel
 
 __all__ = [
     "LenderCreate", "LenderUpdate", "LenderResponse", "LenderList",
-    # "APIConfigCreate", "APIConfigUpdate", "APIConfigResponse", "APIConfigList",
-    # "APITemplateCreate", "APITemplateUpdate", "APITemplateResponse", "APITemplateList",
+    "APIConfigCreate", "APIConfigUpdate",
+    "APITemplateCreate", "APITemplateUpdate",
     # "GeneratedAPICreate", "GeneratedAPIUpdate", "GeneratedAPIResponse", "GeneratedAPIList",
-    # "APITestCreate", "APITestUpdate", "APITestResponse", "APITestList",
+    "APITestCreate", "APITestUpdate",
     # "UserCreate", "UserUpdate", "UserResponse", "UserList",
     "PaginationParams", "ResponseModel"
 ]
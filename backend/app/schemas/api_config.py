@@ -0,0 +1,66 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
+
+
+class APIConfigBase(BaseModel):
+    """Base API configuration schema with common fields"""
+    name: str = Field(..., min_length=1, max_length=255, description="Configuration name")
+    description: Optional[str] = Field(None, description="Configuration description")
+
+    # API configuration
+    endpoint_path: str = Field(..., min_length=1, max_length=500, description="Endpoint path relative to the lender base URL")
+    method: str = Field(default="GET", pattern="^(GET|POST|PUT|PATCH|DELETE)$", description="HTTP method")
+
+    # Request configuration
+    headers: Optional[Dict[str, Any]] = Field(None, description="Default headers")
+    query_params: Optional[Dict[str, Any]] = Field(None, description="Default query parameters")
+    request_body_schema: Optional[Dict[str, Any]] = Field(None, description="JSON schema for the request body")
+
+    # Response configuration
+    response_schema: Optional[Dict[str, Any]] = Field(None, description="Expected response schema")
+    success_codes: Optional[List[int]] = Field(None, description="HTTP status codes treated as success")
+
+    # Authentication
+    requires_auth: bool = Field(default=True, description="Whether the endpoint requires authentication")
+    auth_parameters: Optional[Dict[str, Any]] = Field(None, description="Required auth parameters")
+
+    # Rate limiting and retry
+    rate_limit: Optional[int] = Field(None, ge=1, description="Override lender rate limit (requests per minute)")
+    retry_config: Optional[Dict[str, Any]] = Field(None, description="Retry configuration")
+
+    # Validation and transformation
+    validation_rules: Optional[Dict[str, Any]] = Field(None, description="Custom validation rules")
+    data_mapping: Optional[Dict[str, Any]] = Field(None, description="Field mapping configuration")
+
+    # Status and versioning
+    is_active: bool = Field(default=True, description="Whether the configuration is active")
+    is_deprecated: bool = Field(default=False, description="Whether the configuration is deprecated")
+    version: str = Field(default="1.0.0", max_length=50, description="Configuration version")
+
+
+class APIConfigCreate(APIConfigBase):
+    """Schema for creating a new API configuration"""
+    lender_id: int = Field(..., ge=1, description="Owning lender ID")
+
+
+class APIConfigUpdate(BaseModel):
+    """Schema for updating an API configuration"""
+    lender_id: Optional[int] = Field(None, ge=1)
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    endpoint_path: Optional[str] = Field(None, min_length=1, max_length=500)
+    method: Optional[str] = Field(None, pattern="^(GET|POST|PUT|PATCH|DELETE)$")
+    headers: Optional[Dict[str, Any]] = None
+    query_params: Optional[Dict[str, Any]] = None
+    request_body_schema: Optional[Dict[str, Any]] = None
+    response_schema: Optional[Dict[str, Any]] = None
+    success_codes: Optional[List[int]] = None
+    requires_auth: Optional[bool] = None
+    auth_parameters: Optional[Dict[str, Any]] = None
+    rate_limit: Optional[int] = Field(None, ge=1)
+    retry_config: Optional[Dict[str, Any]] = None
+    validation_rules: Optional[Dict[str, Any]] = None
+    data_mapping: Optional[Dict[str, Any]] = None
+    is_active: Optional[bool] = None
+    is_deprecated: Optional[bool] = None
+    version: Optional[str] = Field(None, max_length=50)
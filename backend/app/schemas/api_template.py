@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Any
+
+
+class APITemplateBase(BaseModel):
+    """Base API template schema with common fields"""
+    name: str = Field(..., min_length=1, max_length=255, description="Template name")
+    description: Optional[str] = Field(None, description="Template description")
+    category: Optional[str] = Field(None, max_length=100, description="Template category")
+
+    # Template content
+    template_type: str = Field(..., min_length=1, max_length=50, description="Template engine/type, e.g. jinja2_python")
+    template_content: str = Field(..., min_length=1, description="Template source")
+
+    # Template metadata
+    variables: Optional[Any] = Field(None, description="Required variables for the template")
+    dependencies: Optional[Any] = Field(None, description="Required dependencies/packages")
+    file_extension: Optional[str] = Field(None, max_length=20, description="Generated file extension")
+
+    # Configuration and versioning
+    is_system_template: bool = Field(default=False, description="Whether this is a system template")
+    is_active: bool = Field(default=True, description="Whether the template is active")
+    version: str = Field(default="1.0.0", max_length=50, description="Template version")
+    parent_template_id: Optional[int] = Field(None, ge=1, description="Parent template for inheritance")
+
+
+class APITemplateCreate(APITemplateBase):
+    """Schema for creating a new API template"""
+    pass
+
+
+class APITemplateUpdate(BaseModel):
+    """Schema for updating an API template"""
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    category: Optional[str] = Field(None, max_length=100)
+    template_type: Optional[str] = Field(None, min_length=1, max_length=50)
+    template_content: Optional[str] = Field(None, min_length=1)
+    variables: Optional[Any] = None
+    dependencies: Optional[Any] = None
+    file_extension: Optional[str] = Field(None, max_length=20)
+    is_system_template: Optional[bool] = None
+    is_active: Optional[bool] = None
+    version: Optional[str] = Field(None, max_length=50)
+    parent_template_id: Optional[int] = Field(None, ge=1)
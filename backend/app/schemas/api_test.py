@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any
+
+
+class APITestBase(BaseModel):
+    """Base API test schema with common fields"""
+    name: str = Field(..., min_length=1, max_length=255, description="Test name")
+    description: Optional[str] = Field(None, description="Test description")
+    test_type: str = Field(..., min_length=1, max_length=50, description="Test type, e.g. unit, integration, e2e, performance")
+
+    # Test parameters
+    test_data: Optional[Dict[str, Any]] = Field(None, description="Input data for the test")
+    expected_response: Optional[Dict[str, Any]] = Field(None, description="Expected response structure")
+    validation_rules: Optional[Dict[str, Any]] = Field(None, description="Custom validation rules")
+
+    # Test execution
+    is_active: bool = Field(default=True, description="Whether the test is active")
+    is_automated: bool = Field(default=True, description="Whether the test runs automatically")
+    execution_order: int = Field(default=0, description="Order within the config's test suite")
+
+    # Test environment
+    environment: str = Field(default="development", max_length=50, description="Target environment")
+    timeout: int = Field(default=30, ge=1, le=300, description="Test timeout in seconds")
+
+
+class APITestCreate(APITestBase):
+    """Schema for creating a new API test"""
+    api_config_id: int = Field(..., ge=1, description="API configuration under test")
+
+
+class APITestUpdate(BaseModel):
+    """Schema for updating an API test"""
+    api_config_id: Optional[int] = Field(None, ge=1)
+    name: Optional[str] = Field(None, min_length=1, max_length=255)
+    description: Optional[str] = None
+    test_type: Optional[str] = Field(None, min_length=1, max_length=50)
+    test_data: Optional[Dict[str, Any]] = None
+    expected_response: Optional[Dict[str, Any]] = None
+    validation_rules: Optional[Dict[str, Any]] = None
+    is_active: Optional[bool] = None
+    is_automated: Optional[bool] = None
+    execution_order: Optional[int] = None
+    environment: Optional[str] = Field(None, max_length=50)
+    timeout: Optional[int] = Field(None, ge=1, le=300)
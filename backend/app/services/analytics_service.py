@@ -1,20 +1,318 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, desc
+from sqlalchemy import select, func, and_, or_, desc, case, cast, text, JSON, Numeric, String
 from sqlalchemy.orm import joinedload
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 import structlog
 
 from ..models.integration import IntegrationLog, Integration, IntegrationSequence
 from ..models.lender import Lender
 from ..models.field_mapping import FieldMapping
+from ..core.cache import ANALYTICS_CACHE_PREFIX, cached, Uncached
 
-logger = structlog.get_logger()
+logger = structlog.get_logger(__name__)
+
+# Every comprehensive-analytics section in one round-trip. Mirrors the
+# per-section methods below; enum columns are stored by name, hence lower().
+_COMPREHENSIVE_ANALYTICS_SQL = text("""
+WITH window_logs AS (
+    SELECT l.id, l.sequence_id, l.request_id, l.response_status, l.duration_ms,
+           l.lead_id, l.error_code, l.error_message, l.request_time, i.lender_id
+    FROM integration_logs l
+    JOIN integrations i ON i.id = l.integration_id
+    WHERE l.request_time >= :start_date
+),
+scoped_logs AS (
+    SELECT * FROM window_logs
+    WHERE CAST(:lender_id AS INTEGER) IS NULL OR lender_id = CAST(:lender_id AS INTEGER)
+),
+dash AS (
+    SELECT count(*) AS total_requests,
+           count(*) FILTER (WHERE response_status < 400) AS successful_requests,
+           avg(duration_ms) AS avg_response_time,
+           count(DISTINCT lead_id) AS total_leads
+    FROM scoped_logs
+),
+perf AS (
+    SELECT le.id AS lender_id,
+           le.name AS lender_name,
+           count(*) AS total_requests,
+           count(*) FILTER (WHERE w.response_status < 400) AS successful_requests,
+           count(*) - count(*) FILTER (WHERE w.response_status < 400) AS failed_requests,
+           round(count(*) FILTER (WHERE w.response_status < 400) * 100.0 / count(*), 2) AS success_rate,
+           round(coalesce(avg(w.duration_ms) FILTER (WHERE w.duration_ms <> 0), 0), 2) AS avg_response_time_ms,
+           count(DISTINCT w.lead_id) AS total_leads
+    FROM window_logs w
+    JOIN lenders le ON le.id = w.lender_id
+    GROUP BY le.id, le.name
+),
+errs AS (
+    SELECT e.response_status::text || ' - ' || coalesce(e.error_code, 'Unknown') AS error_type,
+           count(*) AS count,
+           (array_agg(json_build_object(
+               'error_message', e.error_message,
+               'request_time', e.request_time,
+               'lender_name', le.name
+           ) ORDER BY e.request_time DESC))[1:3] AS examples
+    FROM scoped_logs e
+    JOIN lenders le ON le.id = e.lender_id
+    WHERE e.response_status >= 400
+    GROUP BY 1
+),
+trends AS (
+    SELECT date_trunc('day', request_time) AS day,
+           avg(duration_ms) AS avg_response_time,
+           count(*) AS request_count
+    FROM scoped_logs
+    WHERE duration_ms IS NOT NULL
+    GROUP BY 1
+),
+health AS (
+    SELECT i.id AS integration_id,
+           i.name AS integration_name,
+           le.name AS lender_name,
+           lower(i.status::text) AS status,
+           count(l.id) AS total_recent,
+           count(l.id) FILTER (WHERE l.response_status < 400) AS successful_recent,
+           max(l.request_time) FILTER (WHERE l.response_status < 400) AS last_successful,
+           max(l.request_time) FILTER (WHERE l.response_status IS NULL OR l.response_status >= 400) AS last_failed
+    FROM integrations i
+    JOIN lenders le ON le.id = i.lender_id
+    LEFT JOIN integration_logs l
+        ON l.integration_id = i.id AND l.request_time >= :health_since
+    GROUP BY i.id, i.name, le.name, i.status
+),
+health_rated AS (
+    SELECT *,
+           CASE
+               WHEN total_recent = 0 THEN 'unknown'
+               WHEN successful_recent = total_recent THEN 'healthy'
+               WHEN successful_recent > total_recent * 0.8 THEN 'warning'
+               ELSE 'critical'
+           END AS health
+    FROM health
+),
+fm AS (
+    SELECT coalesce(lower(transformation_type::text), 'none') AS transformation_type,
+           count(*) AS total,
+           count(*) FILTER (WHERE is_active) AS active,
+           count(*) FILTER (WHERE is_required) AS required
+    FROM field_mappings
+    WHERE CAST(:lender_id AS INTEGER) IS NULL OR lender_id = CAST(:lender_id AS INTEGER)
+    GROUP BY 1
+),
+seq_runs AS (
+    SELECT sequence_id,
+           request_id,
+           bool_and(coalesce(response_status < 400, false)) AS succeeded,
+           sum(coalesce(duration_ms, 0)) AS execution_time
+    FROM window_logs
+    WHERE sequence_id IS NOT NULL
+    GROUP BY sequence_id, request_id
+),
+seq AS (
+    SELECT s.id AS sequence_id,
+           s.name AS sequence_name,
+           le.name AS lender_name,
+           count(*) AS total_executions,
+           count(*) FILTER (WHERE r.succeeded) AS successful_executions,
+           count(*) FILTER (WHERE NOT r.succeeded) AS failed_executions,
+           count(*) FILTER (WHERE r.succeeded) * 100.0 / count(*) AS success_rate,
+           round(avg(r.execution_time), 2) AS avg_execution_time_ms,
+           s.execution_mode,
+           (SELECT count(*) FROM integrations st WHERE st.parent_sequence_id = s.id) AS step_count
+    FROM seq_runs r
+    JOIN integration_sequences s ON s.id = r.sequence_id
+    JOIN lenders le ON le.id = s.lender_id
+    GROUP BY s.id, s.name, le.name, s.execution_mode
+)
+SELECT json_build_object(
+    'dashboard_metrics', (
+        SELECT json_build_object(
+            'total_requests', total_requests,
+            'successful_requests', successful_requests,
+            'failed_requests', total_requests - successful_requests,
+            'success_rate', CASE WHEN total_requests > 0
+                THEN round(successful_requests * 100.0 / total_requests, 2) ELSE 0 END,
+            'avg_response_time_ms', round(coalesce(avg_response_time, 0), 2),
+            'total_leads', total_leads,
+            'period_days', CAST(:days AS INTEGER)
+        )
+        FROM dash
+    ),
+    'lender_performance', coalesce(
+        (SELECT json_agg(perf ORDER BY success_rate DESC) FROM perf), '[]'::json
+    ),
+    'error_analysis', coalesce(
+        (SELECT json_agg(errs ORDER BY count DESC) FROM errs), '[]'::json
+    ),
+    'response_time_trends', coalesce(
+        (SELECT json_agg(json_build_object(
+            'date', to_char(day, 'YYYY-MM-DD'),
+            'avg_response_time_ms', round(coalesce(avg_response_time, 0), 2),
+            'request_count', request_count
+        ) ORDER BY day) FROM trends), '[]'::json
+    ),
+    'integration_health', coalesce(
+        (SELECT json_agg(json_build_object(
+            'integration_id', integration_id,
+            'integration_name', integration_name,
+            'lender_name', lender_name,
+            'health', health,
+            'total_recent_requests', total_recent,
+            'successful_recent_requests', successful_recent,
+            'success_rate', CASE WHEN total_recent > 0
+                THEN successful_recent * 100.0 / total_recent ELSE 0 END,
+            'last_successful', last_successful,
+            'last_failed', last_failed,
+            'status', status
+        ) ORDER BY CASE health
+            WHEN 'critical' THEN 0 WHEN 'warning' THEN 1 WHEN 'healthy' THEN 2 ELSE 3 END
+        ) FROM health_rated), '[]'::json
+    ),
+    'field_mapping_analytics', (
+        SELECT json_build_object(
+            'total_mappings', coalesce(sum(total), 0),
+            'active_mappings', coalesce(sum(active), 0),
+            'required_mappings', coalesce(sum(required), 0),
+            'transformation_distribution', coalesce(json_object_agg(transformation_type, total), '{}'::json),
+            'most_common_transformations', coalesce(
+                (SELECT json_agg(json_build_array(transformation_type, total) ORDER BY total DESC)
+                 FROM (SELECT * FROM fm ORDER BY total DESC LIMIT 5) top), '[]'::json
+            ),
+            'active_rate', CASE WHEN sum(total) > 0 THEN sum(active) * 100.0 / sum(total) ELSE 0 END
+        )
+        FROM fm
+    ),
+    'sequence_performance', coalesce(
+        (SELECT json_agg(seq ORDER BY success_rate DESC) FROM seq), '[]'::json
+    )
+) AS payload
+""").columns(payload=JSON)
+
+
+# Dashboard metrics and the most frequent error types from one scan of the
+# recent log window; window_logs is referenced twice, so Postgres
+# materializes it once.
+_RECENT_SNAPSHOT_SQL = text("""
+WITH window_logs AS (
+    SELECT l.response_status, l.duration_ms, l.lead_id, l.error_code,
+           l.error_message, l.request_time, le.name AS lender_name
+    FROM integration_logs l
+    JOIN integrations i ON i.id = l.integration_id
+    JOIN lenders le ON le.id = i.lender_id
+    WHERE l.request_time >= :start_date
+),
+errs AS (
+    SELECT response_status::text || ' - ' || coalesce(error_code, 'Unknown') AS error_type,
+           count(*) AS count,
+           (array_agg(json_build_object(
+               'error_message', error_message,
+               'request_time', request_time,
+               'lender_name', lender_name
+           ) ORDER BY request_time DESC))[1:3] AS examples
+    FROM window_logs
+    WHERE response_status >= 400
+    GROUP BY 1
+    ORDER BY count DESC
+    LIMIT :error_limit
+)
+SELECT json_build_object(
+    'metrics', (
+        SELECT json_build_object(
+            'total_requests', count(*),
+            'successful_requests', count(*) FILTER (WHERE response_status < 400),
+            'failed_requests', count(*) - count(*) FILTER (WHERE response_status < 400),
+            'success_rate', CASE WHEN count(*) > 0
+                THEN round(count(*) FILTER (WHERE response_status < 400) * 100.0 / count(*), 2) ELSE 0 END,
+            'avg_response_time_ms', round(coalesce(avg(duration_ms), 0), 2),
+            'total_leads', count(DISTINCT lead_id),
+            'period_days', CAST(:days AS INTEGER)
+        )
+        FROM window_logs
+    ),
+    'errors', coalesce(
+        (SELECT json_agg(errs ORDER BY count DESC) FROM errs), '[]'::json
+    )
+) AS payload
+""").columns(payload=JSON)
+
+
+# Fingerprint of the tables behind the analytics. integration_logs is
+# append-only, so its max id is enough; the small config tables also
+# contribute a row count to catch deletes. The time bucket bounds how long
+# a version can outlive the moving analysis window.
+_DATA_VERSION_SQL = text("""
+SELECT md5(concat_ws('|',
+    (SELECT max(id) FROM integration_logs),
+    (SELECT count(*) || ',' || coalesce(greatest(max(created_at), max(updated_at))::text, '')
+     FROM integrations),
+    (SELECT count(*) || ',' || coalesce(greatest(max(created_at), max(updated_at))::text, '')
+     FROM integration_sequences),
+    (SELECT count(*) || ',' || coalesce(greatest(max(created_at), max(updated_at))::text, '')
+     FROM lenders),
+    (SELECT count(*) || ',' || coalesce(greatest(max(created_at), max(updated_at))::text, '')
+     FROM field_mappings),
+    floor(extract(epoch FROM now()) / CAST(:bucket_seconds AS INTEGER))
+))
+""")
 
 
 class AnalyticsService:
     """Service for integration analytics and monitoring"""
     
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=60)
+    async def get_comprehensive(
+        self,
+        db: AsyncSession,
+        days: int = 30,
+        lender_id: Optional[int] = None,
+        version: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get every analytics section in a single database round-trip.
+
+        version (from get_data_version) is not used by the query; it is part
+        of the cache key so a cached result never outlives the data it reflects.
+        """
+        now = datetime.now()
+        result = await db.execute(
+            _COMPREHENSIVE_ANALYTICS_SQL,
+            {
+                "start_date": now - timedelta(days=days),
+                "health_since": now - timedelta(hours=24),
+                "days": days,
+                "lender_id": lender_id
+            }
+        )
+        return result.scalar_one()
+    
+    async def get_data_version(
+        self,
+        db: AsyncSession,
+        bucket_seconds: int = 60
+    ) -> str:
+        """Get a fingerprint that changes whenever the analytics source data does"""
+        return await db.scalar(_DATA_VERSION_SQL, {"bucket_seconds": bucket_seconds})
+    
+    async def get_recent_snapshot(
+        self,
+        db: AsyncSession,
+        days: int = 1,
+        error_limit: int = 5
+    ) -> Dict[str, Any]:
+        """Get dashboard metrics and top error types for a recent window in one query"""
+        result = await db.execute(
+            _RECENT_SNAPSHOT_SQL,
+            {
+                "start_date": datetime.now() - timedelta(days=days),
+                "days": days,
+                "error_limit": error_limit
+            }
+        )
+        return result.scalar_one()
+    
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=60)
     async def get_dashboard_metrics(
         self,
         db: AsyncSession,
@@ -80,8 +378,8 @@ class AnalyticsService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to get dashboard metrics: {e}")
-            return {
+            logger.error("Failed to get dashboard metrics", error=str(e))
+            return Uncached({
                 'total_requests': 0,
                 'successful_requests': 0,
                 'failed_requests': 0,
@@ -89,127 +387,165 @@ class AnalyticsService:
                 'avg_response_time_ms': 0,
                 'total_leads': 0,
                 'period_days': days
-            }
+            })
     
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=300)
     async def get_lender_performance(
         self,
         db: AsyncSession,
-        days: int = 30
+        days: int = 30,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get performance metrics by lender"""
+        """Get performance metrics by lender, best success rate first"""
         try:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            # Get lenders with their integration logs
-            lenders_query = select(Lender).options(
-                joinedload(Lender.integrations)
+            total_requests = func.count(IntegrationLog.id)
+            successful_requests = func.count(IntegrationLog.id).filter(IntegrationLog.response_status < 400)
+            
+            # Aggregate per lender in the database; lenders without traffic are skipped
+            performance_query = select(
+                Lender.id.label('lender_id'),
+                Lender.name.label('lender_name'),
+                total_requests.label('total_requests'),
+                successful_requests.label('successful_requests'),
+                func.avg(IntegrationLog.duration_ms).filter(IntegrationLog.duration_ms != 0).label('avg_response_time'),
+                func.count(func.distinct(IntegrationLog.lead_id)).label('total_leads')
+            ).select_from(IntegrationLog).join(
+                Integration, Integration.id == IntegrationLog.integration_id
+            ).join(
+                Lender, Lender.id == Integration.lender_id
+            ).where(
+                IntegrationLog.request_time >= start_date
+            ).group_by(
+                Lender.id, Lender.name
+            ).order_by(
+                desc(cast(successful_requests, Numeric) / total_requests)
             )
-            lenders = (await db.execute(lenders_query)).scalars().all()
             
-            lender_performance = []
-            
-            for lender in lenders:
-                # Get logs for this lender
-                logs_query = select(IntegrationLog).join(Integration).where(
-                    and_(
-                        Integration.lender_id == lender.id,
-                        IntegrationLog.request_time >= start_date
-                    )
-                )
-                logs = (await db.execute(logs_query)).scalars().all()
-                
-                if not logs:
-                    continue
-                
-                # Calculate metrics
-                total_requests = len(logs)
-                successful_requests = len([log for log in logs if log.response_status and log.response_status < 400])
-                failed_requests = total_requests - successful_requests
-                success_rate = (successful_requests / total_requests * 100) if total_requests > 0 else 0
-                
-                avg_response_time = 0
-                response_times = [log.duration_ms for log in logs if log.duration_ms]
-                if response_times:
-                    avg_response_time = sum(response_times) / len(response_times)
-                
-                total_leads = len(set([log.lead_id for log in logs if log.lead_id]))
-                
-                lender_performance.append({
-                    'lender_id': lender.id,
-                    'lender_name': lender.name,
-                    'total_requests': total_requests,
-                    'successful_requests': successful_requests,
-                    'failed_requests': failed_requests,
-                    'success_rate': round(success_rate, 2),
-                    'avg_response_time_ms': round(avg_response_time, 2),
-                    'total_leads': total_leads
-                })
+            if limit:
+                performance_query = performance_query.limit(limit)
             
-            # Sort by success rate descending
-            lender_performance.sort(key=lambda x: x['success_rate'], reverse=True)
+            rows = (await db.execute(performance_query)).all()
             
-            return lender_performance
+            return [
+                {
+                    'lender_id': row.lender_id,
+                    'lender_name': row.lender_name,
+                    'total_requests': row.total_requests,
+                    'successful_requests': row.successful_requests,
+                    'failed_requests': row.total_requests - row.successful_requests,
+                    'success_rate': round(row.successful_requests / row.total_requests * 100, 2),
+                    'avg_response_time_ms': round(float(row.avg_response_time or 0), 2),
+                    'total_leads': row.total_leads
+                }
+                for row in rows
+            ]
             
         except Exception as e:
-            logger.error(f"Failed to get lender performance: {e}")
-            return []
+            logger.error("Failed to get lender performance", error=str(e))
+            return Uncached([])
     
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=60)
     async def get_error_analysis(
         self,
         db: AsyncSession,
         days: int = 30,
-        lender_id: Optional[int] = None
+        lender_id: Optional[int] = None,
+        min_count: Optional[int] = None,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get error analysis and trends"""
+        """Get error analysis and trends, most frequent error types first"""
         try:
             end_date = datetime.now()
             start_date = end_date - timedelta(days=days)
             
-            # Build query for failed requests
-            error_query = select(IntegrationLog).where(
-                and_(
-                    IntegrationLog.request_time >= start_date,
-                    IntegrationLog.response_status >= 400
-                )
+            error_type = cast(IntegrationLog.response_status, String) + ' - ' + func.coalesce(
+                IntegrationLog.error_code, 'Unknown'
             )
+            error_count = func.count(IntegrationLog.id)
             
+            error_filter = and_(
+                IntegrationLog.request_time >= start_date,
+                IntegrationLog.response_status >= 400
+            )
             if lender_id:
-                error_query = error_query.join(Integration).where(
-                    Integration.lender_id == lender_id
-                )
+                error_filter = and_(error_filter, Integration.lender_id == lender_id)
+            
+            # Group failed requests by type in the database
+            counts_query = select(
+                error_type.label('error_type'),
+                error_count.label('error_count')
+            ).select_from(IntegrationLog).join(
+                Integration, Integration.id == IntegrationLog.integration_id
+            ).where(
+                error_filter
+            ).group_by(
+                error_type
+            ).order_by(
+                error_count.desc()
+            )
             
-            error_logs = (await db.execute(error_query)).scalars().all()
-            
-            # Group errors by type
-            error_counts = {}
-            for log in error_logs:
-                error_type = f"{log.response_status} - {log.error_code or 'Unknown'}"
-                if error_type not in error_counts:
-                    error_counts[error_type] = {
-                        'error_type': error_type,
-                        'count': 0,
-                        'examples': []
-                    }
-                
-                error_counts[error_type]['count'] += 1
-                if len(error_counts[error_type]['examples']) < 3:
-                    error_counts[error_type]['examples'].append({
-                        'error_message': log.error_message,
-                        'request_time': log.request_time.isoformat(),
-                        'lender_name': log.integration.lender.name if log.integration else 'Unknown'
-                    })
+            if min_count:
+                counts_query = counts_query.having(error_count >= min_count)
+            if limit:
+                counts_query = counts_query.limit(limit)
+            
+            counts = (await db.execute(counts_query)).all()
+            if not counts:
+                return []
+            
+            # Fetch the three most recent examples for the selected error types only
+            ranked = select(
+                error_type.label('error_type'),
+                IntegrationLog.error_message,
+                IntegrationLog.request_time,
+                Lender.name.label('lender_name'),
+                func.row_number().over(
+                    partition_by=[
+                        IntegrationLog.response_status,
+                        func.coalesce(IntegrationLog.error_code, 'Unknown')
+                    ],
+                    order_by=IntegrationLog.request_time.desc()
+                ).label('position')
+            ).select_from(IntegrationLog).join(
+                Integration, Integration.id == IntegrationLog.integration_id
+            ).join(
+                Lender, Lender.id == Integration.lender_id
+            ).where(
+                error_filter
+            ).subquery()
             
-            # Convert to list and sort by count
-            error_analysis = list(error_counts.values())
-            error_analysis.sort(key=lambda x: x['count'], reverse=True)
+            examples_query = select(ranked).where(
+                and_(
+                    ranked.c.position <= 3,
+                    ranked.c.error_type.in_([row.error_type for row in counts])
+                )
+            ).order_by(ranked.c.error_type, ranked.c.position)
+            
+            examples: Dict[str, List[Dict[str, Any]]] = {}
+            for example in (await db.execute(examples_query)).all():
+                examples.setdefault(example.error_type, []).append({
+                    'error_message': example.error_message,
+                    'request_time': example.request_time,
+                    'lender_name': example.lender_name
+                })
             
-            return error_analysis
+            return [
+                {
+                    'error_type': row.error_type,
+                    'count': row.error_count,
+                    'examples': examples.get(row.error_type, [])
+                }
+                for row in counts
+            ]
             
         except Exception as e:
-            logger.error(f"Failed to get error analysis: {e}")
-            return []
+            logger.error("Failed to get error analysis", error=str(e))
+            return Uncached([])
     
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=300)
     async def get_response_time_trends(
         self,
         db: AsyncSession,
@@ -254,9 +590,10 @@ class AnalyticsService:
             ]
             
         except Exception as e:
-            logger.error(f"Failed to get response time trends: {e}")
-            return []
+            logger.error("Failed to get response time trends", error=str(e))
+            return Uncached([])
     
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=30)
     async def get_integration_health(
         self,
         db: AsyncSession
@@ -316,8 +653,8 @@ class AnalyticsService:
                     'total_recent_requests': total_recent,
                     'successful_recent_requests': successful_recent,
                     'success_rate': (successful_recent / total_recent * 100) if total_recent > 0 else 0,
-                    'last_successful': last_successful.isoformat() if last_successful else None,
-                    'last_failed': last_failed.isoformat() if last_failed else None,
+                    'last_successful': last_successful,
+                    'last_failed': last_failed,
                     'status': integration.status.value
                 })
             
@@ -328,9 +665,85 @@ class AnalyticsService:
             return health_status
             
         except Exception as e:
-            logger.error(f"Failed to get integration health: {e}")
-            return []
+            logger.error("Failed to get integration health", error=str(e))
+            return Uncached([])
     
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=30)
+    async def get_health_buckets(
+        self,
+        db: AsyncSession
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get critical and warning integrations, bucketed by health in the database"""
+        try:
+            recent_time = datetime.now() - timedelta(hours=24)
+            
+            total_recent = func.count(IntegrationLog.id)
+            successful_recent = func.count(IntegrationLog.id).filter(IntegrationLog.response_status < 400)
+            
+            # Inner join drops integrations without recent traffic ('unknown'),
+            # HAVING drops fully successful ones ('healthy')
+            integration_health = select(
+                Integration.id.label('integration_id'),
+                Integration.name.label('integration_name'),
+                Lender.name.label('lender_name'),
+                func.lower(cast(Integration.status, String)).label('status'),
+                total_recent.label('total_recent'),
+                successful_recent.label('successful_recent'),
+                func.max(IntegrationLog.request_time).filter(
+                    IntegrationLog.response_status < 400
+                ).label('last_successful'),
+                func.max(IntegrationLog.request_time).filter(
+                    or_(IntegrationLog.response_status.is_(None), IntegrationLog.response_status >= 400)
+                ).label('last_failed'),
+                case(
+                    (successful_recent > total_recent * 0.8, 'warning'),
+                    else_='critical'
+                ).label('health')
+            ).select_from(Integration).join(
+                Lender, Lender.id == Integration.lender_id
+            ).join(
+                IntegrationLog,
+                and_(
+                    IntegrationLog.integration_id == Integration.id,
+                    IntegrationLog.request_time >= recent_time
+                )
+            ).group_by(
+                Integration.id, Integration.name, Lender.name, Integration.status
+            ).having(
+                successful_recent < total_recent
+            ).subquery()
+            
+            health = integration_health.c
+            buckets_query = select(
+                health.health,
+                func.json_agg(
+                    aggregate_order_by(
+                        func.json_build_object(
+                            'integration_id', health.integration_id,
+                            'integration_name', health.integration_name,
+                            'lender_name', health.lender_name,
+                            'health', health.health,
+                            'total_recent_requests', health.total_recent,
+                            'successful_recent_requests', health.successful_recent,
+                            'success_rate', cast(health.successful_recent, Numeric) * 100 / health.total_recent,
+                            'last_successful', health.last_successful,
+                            'last_failed', health.last_failed,
+                            'status', health.status
+                        ),
+                        health.integration_id
+                    ),
+                    type_=JSON
+                ).label('integrations')
+            ).group_by(health.health)
+            
+            rows = (await db.execute(buckets_query)).all()
+            return {row.health: row.integrations for row in rows}
+            
+        except Exception as e:
+            logger.error("Failed to get health buckets", error=str(e))
+            return Uncached({})
+    
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=300)
     async def get_field_mapping_analytics(
         self,
         db: AsyncSession,
@@ -378,16 +791,17 @@ class AnalyticsService:
             }
             
         except Exception as e:
-            logger.error(f"Failed to get field mapping analytics: {e}")
-            return {
+            logger.error("Failed to get field mapping analytics", error=str(e))
+            return Uncached({
                 'total_mappings': 0,
                 'active_mappings': 0,
                 'required_mappings': 0,
                 'transformation_distribution': {},
                 'most_common_transformations': [],
                 'active_rate': 0
-            }
+            })
     
+    @cached(ANALYTICS_CACHE_PREFIX, ttl=300)
     async def get_sequence_performance(
         self,
         db: AsyncSession,
@@ -472,5 +886,5 @@ class AnalyticsService:
             return sequence_performance
             
         except Exception as e:
-            logger.error(f"Failed to get sequence performance: {e}")
-            return []
+            logger.error("Failed to get sequence performance", error=str(e))
+            return Uncached([])
@@ -9,6 +9,7 @@ import jinja2
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import undefer
 
 from ..core.config import settings
 from ..models.lender import Lender
@@ -90,14 +91,14 @@ class APIGenerator:
             template = None
             if template_id:
                 template_result = await db.execute(
-                    select(APITemplate).where(APITemplate.id == template_id)
+                    select(APITemplate).options(undefer(APITemplate.template_content)).where(APITemplate.id == template_id)
                 )
                 template = template_result.scalar_one_or_none()
             
             if not template:
                 # Use default template for language/framework
                 template_result = await db.execute(
-                    select(APITemplate).where(
+                    select(APITemplate).options(undefer(APITemplate.template_content)).where(
                         APITemplate.template_type == f"jinja2_{language}",
                         APITemplate.is_active == True
                     ).order_by(APITemplate.is_system_template.desc())
@@ -1,4 +1,6 @@
+import asyncio
 import os
+from functools import lru_cache
 import json
 import yaml
 from typing import Dict, Any, List, Optional
@@ -12,16 +14,39 @@ import structlog
 logger = structlog.get_logger()
 
 
+@lru_cache(maxsize=1)
+def _template_env() -> jinja2.Environment:
+    """Process-wide Jinja environment, so compiled templates survive across generators.
+
+    Jinja caches each parsed and compiled template on its environment and only
+    reloads one when its file changes on disk.
+    """
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(settings.TEMPLATES_DIR),
+        autoescape=True,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+
+def _read_text(file_path: str) -> str:
+    """Read a UTF-8 text file"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _write_files(directory: str, files: Dict[str, str]) -> None:
+    """Write each file name's content under directory as UTF-8"""
+    for filename, content in files.items():
+        with open(os.path.join(directory, filename), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+
 class DeploymentGenerator:
     """Service for generating deployment configurations for API suites"""
     
     def __init__(self):
-        self.template_env = jinja2.Environment(
-            loader=jinja2.FileSystemLoader(settings.TEMPLATES_DIR),
-            autoescape=True,
-            trim_blocks=True,
-            lstrip_blocks=True
-        )
+        self.template_env = _template_env()
     
     async def generate_deployment_package(
         self,
@@ -31,16 +56,16 @@ class DeploymentGenerator:
     ) -> Dict[str, str]:
         """Generate deployment package for a generated API"""
         try:
-            # Read the generated API file
-            with open(generated_api.file_path, 'r', encoding='utf-8') as f:
-                api_content = f.read()
+            # Read the generated API file; disk I/O runs on worker threads so the
+            # event loop keeps serving while a package is generated in the background
+            api_content = await asyncio.to_thread(_read_text, generated_api.file_path)
             
             # Create deployment directory
             deployment_dir = os.path.join(
                 settings.GENERATED_APIS_DIR,
                 f"deployment_{generated_api.id}"
             )
-            os.makedirs(deployment_dir, exist_ok=True)
+            await asyncio.to_thread(os.makedirs, deployment_dir, exist_ok=True)
             
             # Generate deployment files based on type
             if deployment_type == "docker":
@@ -63,10 +88,7 @@ class DeploymentGenerator:
             files['README.md'] = readme_content
             
             # Write all files
-            for filename, content in files.items():
-                file_path = os.path.join(deployment_dir, filename)
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+            await asyncio.to_thread(_write_files, deployment_dir, files)
             
             logger.info(
                 "Deployment package generated successfully",
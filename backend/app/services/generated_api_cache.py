@@ -0,0 +1,40 @@
+import time
+from typing import Any, Dict, Tuple
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.generated_api import GeneratedAPI
+
+# GeneratedAPI columns the deployment endpoints read, cached per id for a short TTL
+GENERATED_API_COLUMNS = (
+    GeneratedAPI.id, GeneratedAPI.name, GeneratedAPI.description, GeneratedAPI.file_path,
+    GeneratedAPI.language, GeneratedAPI.framework, GeneratedAPI.dependencies, GeneratedAPI.created_at
+)
+GENERATED_API_CACHE_TTL = 30
+GENERATED_API_CACHE_MAXSIZE = 1024
+_generated_api_cache: Dict[int, Tuple[float, Any]] = {}
+
+# Built once so every lookup reuses the same statement and its compiled form
+_GENERATED_API_STMT = select(*GENERATED_API_COLUMNS).where(GeneratedAPI.id == bindparam("generated_api_id"))
+
+
+async def get_cached_generated_api(db: AsyncSession, generated_api_id: int):
+    """Return the GeneratedAPI projection for an id, or None, skipping the DB on a fresh cache hit"""
+    now = time.monotonic()
+    cached = _generated_api_cache.get(generated_api_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    result = await db.execute(_GENERATED_API_STMT, {"generated_api_id": generated_api_id})
+    generated_api = result.one_or_none()
+    if generated_api is not None:
+        if len(_generated_api_cache) >= GENERATED_API_CACHE_MAXSIZE:
+            # Evict the oldest insertion
+            _generated_api_cache.pop(next(iter(_generated_api_cache)))
+        _generated_api_cache[generated_api_id] = (now + GENERATED_API_CACHE_TTL, generated_api)
+    return generated_api
+
+
+def invalidate_generated_api(generated_api_id: int) -> None:
+    """Drop a cached GeneratedAPI projection in this process"""
+    _generated_api_cache.pop(generated_api_id, None)
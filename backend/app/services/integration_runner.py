@@ -12,6 +12,7 @@ from sqlalchemy import select
 from ..models.lender import Lender
 from ..models.integration import IntegrationSequence, Integration, IntegrationLog, IntegrationStatus
 from ..models.field_mapping import FieldMapping
+from ..core.cache import ANALYTICS_CACHE_PREFIX, invalidate_namespace
 
 
 def _join_url(base_url: str, endpoint: str) -> str:
@@ -264,6 +265,7 @@ class IntegrationRunner:
                 )
                 db.add(log)
                 await db.commit()
+                await invalidate_namespace(ANALYTICS_CACHE_PREFIX)
 
                 return {
                     "step_id": step.id,
@@ -290,6 +292,7 @@ class IntegrationRunner:
                     )
                     db.add(log)
                     await db.commit()
+                    await invalidate_namespace(ANALYTICS_CACHE_PREFIX)
 
                     return {
                         "step_id": step.id,
@@ -11,6 +11,7 @@ from ..models.integration import Integration, IntegrationLog, IntegrationStatus,
 from ..models.field_mapping import FieldMapping
 from ..models.lender import Lender
 from .transformer import DataTransformer
+from ..core.cache import ANALYTICS_CACHE_PREFIX, invalidate_namespace
 
 logger = structlog.get_logger()
 
@@ -372,6 +373,7 @@ class IntegrationService:
             
             db.add(log_entry)
             await db.commit()
+            await invalidate_namespace(ANALYTICS_CACHE_PREFIX)
             
         except Exception as e:
             logger.error(f"Failed to log integration: {e}")
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, Optional
+from sqlalchemy import update, case
+import structlog
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.user import User
+
+logger = structlog.get_logger()
+
+
+class LoginRecorder:
+    """Buffers last_login_at stamps and writes them in one batched UPDATE"""
+    
+    def __init__(self, interval: float = settings.LAST_LOGIN_FLUSH_INTERVAL):
+        self.interval = interval
+        self._pending: Dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def record(self, user_id: int, logged_in_at: datetime) -> None:
+        """Queue a login; repeat logins before the next flush keep the latest time"""
+        self._pending[user_id] = logged_in_at
+    
+    def _requeue(self, pending: Dict[int, datetime]) -> None:
+        """Put an unwritten batch back, keeping the newer time for users who logged in since"""
+        for user_id, logged_in_at in pending.items():
+            current = self._pending.get(user_id)
+            if current is None or current < logged_in_at:
+                self._pending[user_id] = logged_in_at
+    
+    async def flush(self) -> bool:
+        """Write every pending login with a single UPDATE ... CASE id.
+        
+        A batch that fails (or is cancelled mid-write) goes back into the
+        buffer for the next flush. Returns whether the buffer was written.
+        """
+        if not self._pending:
+            return True
+        pending, self._pending = self._pending, {}
+        try:
+            async with AsyncSessionLocal() as session:
+                await session.execute(
+                    update(User)
+                    .where(User.id.in_(list(pending)))
+                    .values(last_login_at=case(pending, value=User.id))
+                    .execution_options(synchronize_session=False)
+                )
+                await session.commit()
+        except asyncio.CancelledError:
+            self._requeue(pending)
+            raise
+        except Exception as e:
+            self._requeue(pending)
+            logger.error("Failed to record user logins", users=len(pending), error=str(e))
+            return False
+        return True
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.flush()
+    
+    def start(self) -> None:
+        """Start the periodic flush task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Cancel the flush task and write whatever is still buffered.
+        
+        A batch interrupted by the cancel is requeued, so the final flush
+        covers it; a failed final flush is retried once before giving up.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if not await self.flush() and not await self.flush():
+            logger.error("Dropping unrecorded user logins at shutdown", users=len(self._pending))
+
+
+login_recorder = LoginRecorder()
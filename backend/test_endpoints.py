@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""Behaviour tests for the listing, analytics and create endpoints.
+
+The app runs in-process against the configured DATABASE_URL (migrated with
+``alembic upgrade head``) and REDIS_URL; the tests skip when Postgres is not
+reachable. Every row they create carries a unique suffix and is removed again.
+"""
+import uuid
+
+import httpx
+import orjson
+import pytest
+from sqlalchemy import delete, select, text
+
+from app.main import app
+from app.core.cache import ANALYTICS_CACHE_PREFIX, close_redis, invalidate_namespace
+from app.core.database import AsyncSessionLocal, engine
+from app.core.streaming import dumps
+from app.models.field_mapping import FieldMapping
+from app.models.generated_api import GeneratedAPI
+from app.models.integration import AuthenticationType, Integration, IntegrationLog, IntegrationType
+from app.models.lender import Lender
+from app.services.analytics_service import AnalyticsService
+
+pytest_asyncio = pytest.importorskip("pytest_asyncio")
+
+API_PREFIX = "/api/v1"
+
+
+@pytest_asyncio.fixture
+async def client():
+    """HTTP client bound to the app; skips the test when the database is down"""
+    try:
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"Database not available: {e}")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=f"http://test{API_PREFIX}") as http_client:
+        yield http_client
+
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+    await close_redis()
+
+
+def _suffix() -> str:
+    return uuid.uuid4().hex[:8]
+
+
+async def _create_lender(client: httpx.AsyncClient) -> int:
+    response = await client.post("/lenders/", json={
+        "name": f"Test Lender {_suffix()}",
+        "base_url": "https://lender.example.com"
+    })
+    assert response.status_code == 201, response.text
+    return response.json()["data"]["id"]
+
+
+async def _walk_cursor(client: httpx.AsyncClient, path: str, params: dict, list_key: str) -> list:
+    """Follow next_cursor from the first page to the last, returning each page's body"""
+    pages = []
+    cursor = None
+    while True:
+        response = await client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append(body)
+        cursor = body["data"]["next_cursor"]
+        if cursor is None:
+            return pages
+        assert len(pages) < 10, f"{list_key} cursor never ended"
+
+
+def _assert_cursor_pages(pages: list, list_key: str, expected_ids: list, size: int) -> None:
+    assert [row["id"] for page in pages for row in page["data"][list_key]] == expected_ids
+    for index, page in enumerate(pages):
+        is_last = index == len(pages) - 1
+        assert len(page["data"][list_key]) <= size
+        assert page["data"]["total"] == len(expected_ids)
+        assert page["pagination"]["has_next"] is not is_last
+        assert page["pagination"]["has_prev"] is (index > 0)
+        assert (page["data"]["next_cursor"] is None) is is_last
+
+
+@pytest.mark.asyncio
+async def test_create_lender_duplicate_name_conflicts(client):
+    """A second lender with the same name is rejected by the unique index with 409"""
+    payload = {"name": f"Test Lender {_suffix()}", "base_url": "https://lender.example.com"}
+
+    created = await client.post("/lenders/", json=payload)
+    assert created.status_code == 201, created.text
+    try:
+        duplicate = await client.post("/lenders/", json=payload)
+        assert duplicate.status_code == 409
+        assert payload["name"] in duplicate.json()["detail"]
+    finally:
+        await client.delete(f"/lenders/{created.json()['data']['id']}")
+
+
+@pytest.mark.asyncio
+async def test_create_api_template_duplicate_name_conflicts(client):
+    """A second template with the same name is rejected by the unique index with 409"""
+    payload = {
+        "name": f"Test Template {_suffix()}",
+        "template_type": "jinja2_python",
+        "template_content": "print('{{ name }}')"
+    }
+
+    created = await client.post("/api-templates/", json=payload)
+    assert created.status_code == 201, created.text
+    try:
+        duplicate = await client.post("/api-templates/", json=payload)
+        assert duplicate.status_code == 409
+        assert payload["name"] in duplicate.json()["detail"]
+    finally:
+        await client.delete(f"/api-templates/{created.json()['data']['id']}")
+
+
+@pytest.mark.asyncio
+async def test_api_templates_cursor_listing(client):
+    """Keyset pages cover every template exactly once, in the offset listing's order"""
+    category = f"test-{_suffix()}"
+    template_ids = []
+    try:
+        for index in range(5):
+            response = await client.post("/api-templates/", json={
+                "name": f"Test Template {category} {index}",
+                "category": category,
+                "template_type": "jinja2_python",
+                "template_content": "print('{{ name }}')"
+            })
+            assert response.status_code == 201, response.text
+            template_ids.append(response.json()["data"]["id"])
+
+        listing = await client.get("/api-templates/", params={"category": category, "size": 10})
+        expected_ids = [row["id"] for row in listing.json()["data"]["templates"]]
+        assert sorted(expected_ids) == sorted(template_ids)
+
+        pages = await _walk_cursor(client, "/api-templates/", {"category": category, "size": 2}, "templates")
+        assert len(pages) == 3
+        _assert_cursor_pages(pages, "templates", expected_ids, size=2)
+    finally:
+        for template_id in template_ids:
+            await client.delete(f"/api-templates/{template_id}")
+
+
+@pytest.mark.asyncio
+async def test_generated_apis_cursor_listing(client):
+    """Rows sharing a created_at are split across keyset pages by id, none skipped or repeated"""
+    lender_id = await _create_lender(client)
+    try:
+        # One transaction, so every row gets the same server-side now()
+        async with AsyncSessionLocal() as db:
+            db.add_all([
+                GeneratedAPI(
+                    lender_id=lender_id,
+                    name=f"generated_{index}",
+                    file_path=f"/tmp/generated_{lender_id}_{index}.py",
+                    language="python",
+                    framework="fastapi"
+                )
+                for index in range(5)
+            ])
+            await db.commit()
+
+        listing = await client.get("/generated-apis/", params={"lender_id": lender_id, "size": 10})
+        expected_ids = [row["id"] for row in listing.json()["data"]["generated_apis"]]
+        assert len(expected_ids) == 5
+        assert expected_ids == sorted(expected_ids, reverse=True)
+
+        pages = await _walk_cursor(client, "/generated-apis/", {"lender_id": lender_id, "size": 2}, "generated_apis")
+        assert len(pages) == 3
+        _assert_cursor_pages(pages, "generated_apis", expected_ids, size=2)
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(GeneratedAPI).where(GeneratedAPI.lender_id == lender_id))
+            await db.execute(delete(Lender).where(Lender.id == lender_id))
+            await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_api_configs_listing(client):
+    """The pre-encoded listing is valid JSON with the window total, even past the last page"""
+    lender_id = await _create_lender(client)
+    config_ids = []
+    try:
+        for index in range(3):
+            response = await client.post("/api-configs/", json={
+                "lender_id": lender_id,
+                "name": f"Config {index}",
+                "endpoint_path": f"/leads/{index}",
+                "method": "POST"
+            })
+            assert response.status_code == 201, response.text
+            config_ids.append(response.json()["data"]["id"])
+
+        first = await client.get("/api-configs/", params={"lender_id": lender_id, "size": 2})
+        assert first.status_code == 200
+        assert first.headers["content-type"] == "application/json"
+        body = first.json()
+        assert body["success"] is True
+        assert [row["id"] for row in body["data"]["api_configs"]] == config_ids[::-1][:2]
+        assert all("total" not in row for row in body["data"]["api_configs"])
+        assert body["data"]["api_configs"][0]["lender_name"].startswith("Test Lender")
+        assert (body["data"]["total"], body["data"]["pages"]) == (3, 2)
+        assert body["pagination"]["has_next"] is True
+        assert body["pagination"]["has_prev"] is False
+
+        past_end = (await client.get("/api-configs/", params={"lender_id": lender_id, "size": 2, "page": 3})).json()
+        assert past_end["data"]["api_configs"] == []
+        assert past_end["data"]["total"] == 3
+        assert past_end["pagination"]["has_next"] is False
+    finally:
+        for config_id in config_ids:
+            await client.delete(f"/api-configs/{config_id}")
+        await client.delete(f"/lenders/{lender_id}")
+
+
+@pytest.mark.asyncio
+async def test_comprehensive_analytics_etag(client):
+    """A matching If-None-Match gets a 304; JSON and msgpack carry different ETags"""
+    params = {"days": 7}
+
+    first = await client.get("/analytics/comprehensive-analytics", params=params)
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and etag.endswith(':json"')
+
+    cached = await client.get("/analytics/comprehensive-analytics", params=params, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+
+    msgpack = await client.get(
+        "/analytics/comprehensive-analytics",
+        params=params,
+        headers={"If-None-Match": etag, "Accept": "application/msgpack"}
+    )
+    assert msgpack.status_code == 200
+    assert msgpack.headers["content-type"] == "application/msgpack"
+    assert msgpack.headers["etag"] != etag
+
+    other_period = await client.get(
+        "/analytics/comprehensive-analytics",
+        params={"days": 30},
+        headers={"If-None-Match": etag}
+    )
+    assert other_period.status_code == 200
+
+
+def _normalize(value):
+    """JSON round-trip with floats rounded, so SQL json and Python results compare equal"""
+    def _round(item):
+        if isinstance(item, float):
+            return round(item, 2)
+        if isinstance(item, list):
+            return [_round(element) for element in item]
+        if isinstance(item, dict):
+            return {key: _round(element) for key, element in item.items()}
+        return item
+    return _round(orjson.loads(dumps(value)))
+
+
+@pytest.mark.asyncio
+async def test_comprehensive_matches_section_methods(client):
+    """The fused query returns what the seven per-section methods return on the same data"""
+    lender_id = await _create_lender(client)
+    try:
+        async with AsyncSessionLocal() as db:
+            integration = Integration(
+                name="Lead submission",
+                integration_type=IntegrationType.LEAD_SUBMISSION,
+                api_endpoint="https://lender.example.com/leads",
+                auth_type=AuthenticationType.NONE,
+                lender_id=lender_id
+            )
+            db.add(integration)
+            await db.flush()
+            db.add_all([
+                IntegrationLog(
+                    integration_id=integration.id,
+                    request_id=f"req-{lender_id}-{index}",
+                    response_status=status_code,
+                    duration_ms=duration_ms,
+                    error_code=error_code,
+                    error_message=f"{error_code} failure" if error_code else None
+                )
+                for index, (status_code, duration_ms, error_code) in enumerate([
+                    (200, 120, None),
+                    (201, 80, None),
+                    (500, 950, "UPSTREAM_ERROR"),
+                    (422, 40, "VALIDATION_ERROR"),
+                    (500, 700, "UPSTREAM_ERROR")
+                ])
+            ])
+            db.add(FieldMapping(
+                name="first_name",
+                source_field="firstName",
+                target_field="first_name",
+                lender_id=lender_id
+            ))
+            await db.commit()
+
+        # Section results cached before the seed would not reflect it
+        await invalidate_namespace(ANALYTICS_CACHE_PREFIX)
+
+        service = AnalyticsService()
+        async with AsyncSessionLocal() as db:
+            comprehensive = await service.get_comprehensive(db, 30, lender_id, f"test-{_suffix()}")
+            sections = {
+                "dashboard_metrics": await service.get_dashboard_metrics(db, 30, lender_id),
+                "lender_performance": await service.get_lender_performance(db, 30),
+                "error_analysis": await service.get_error_analysis(db, 30, lender_id),
+                "response_time_trends": await service.get_response_time_trends(db, 30, lender_id),
+                "integration_health": await service.get_integration_health(db),
+                "field_mapping_analytics": await service.get_field_mapping_analytics(db, lender_id),
+                "sequence_performance": await service.get_sequence_performance(db, 30)
+            }
+
+        assert comprehensive["dashboard_metrics"]["total_requests"] == 5
+        for name, expected in sections.items():
+            assert _normalize(comprehensive[name]) == _normalize(expected), name
+    finally:
+        async with AsyncSessionLocal() as db:
+            lender_integrations = select(Integration.id).where(Integration.lender_id == lender_id)
+            await db.execute(delete(IntegrationLog).where(IntegrationLog.integration_id.in_(lender_integrations)))
+            await db.execute(delete(Integration).where(Integration.lender_id == lender_id))
+            await db.execute(delete(FieldMapping).where(FieldMapping.lender_id == lender_id))
+            await db.execute(delete(Lender).where(Lender.id == lender_id))
+            await db.commit()
+        await invalidate_namespace(ANALYTICS_CACHE_PREFIX)
@@ -29,6 +29,16 @@ interface GeneratedApi {
   };
 }
 
+interface DeploymentJob {
+  job_id: string;
+  status: 'queued' | 'running' | 'done' | 'failed';
+  error?: string;
+}
+
+// How often a queued deployment build is checked, and for how long before giving up
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
 const Deployments: React.FC = () => {
   const queryClient = useQueryClient();
   const [selectedApi, setSelectedApi] = useState<number | null>(null);
@@ -47,18 +57,36 @@ const Deployments: React.FC = () => {
     () => apiService.get<{ generated_apis: GeneratedApi[] }>('/generated-apis', { size: 100 })
   );
 
-  // Generate deployment package
+  // Generate deployment package: the build is queued, so poll its job until it finishes
   const generateDeploymentMutation = useMutation(
-    (data: { generated_api_id: number; deployment_type: string; config?: any }) =>
-      apiService.post('/deployments/generate-deployment', data),
+    async (data: { generated_api_id: number; deployment_type: string; config?: any }) => {
+      const queued = await apiService.post<DeploymentJob>(
+        `/deployments/generate-deployment?generated_api_id=${data.generated_api_id}&deployment_type=${data.deployment_type}`,
+        data.config
+      );
+      const jobId = queued.data?.job_id;
+      const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+      while (Date.now() < deadline) {
+        await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+        const job = await apiService.get<DeploymentJob>(`/deployments/deployment-job/${jobId}`);
+        if (job.data?.status === 'done') {
+          return job.data;
+        }
+        if (job.data?.status === 'failed') {
+          throw new Error(job.data.error || 'Deployment package generation failed');
+        }
+      }
+      throw new Error('Deployment package generation is taking too long; check its status later');
+    },
     {
       onSuccess: () => {
         queryClient.invalidateQueries(['deployment-status']);
         toast.success('Deployment package generated successfully');
         setShowGenerateModal(false);
       },
-      onError: () => {
-        toast.error('Failed to generate deployment package');
+      onError: (error: unknown) => {
+        queryClient.invalidateQueries(['deployment-status']);
+        toast.error(error instanceof Error && error.message ? error.message : 'Failed to generate deployment package');
       },
     }
   );